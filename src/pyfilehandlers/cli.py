@@ -0,0 +1,494 @@
+"""cli.py
+
+Contains the `pyfilehandlers` command line interface, which converts,
+validates and summarizes batches of files in parallel.
+"""
+
+import argparse
+import collections
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import amulet_nbt
+
+from .file_handler import FileHandler
+from .file_txt import TxtFile
+from .file_yaml import YAMLFile
+
+
+from typing import Any, NamedTuple, Sequence
+
+
+INPUT_SUFFIXES = ('.json', '.jsonl', '.yaml', '.txt', '.csv', '.tsv', '.dat')
+OUTPUT_FORMATS = ('json', 'jsonl', 'yaml', 'txt', 'snbt')
+
+# printed by `lunapyutils.handle_error()`, meaningless in a worker process
+CONTINUE_PROMPT = 'Press Enter to continue'
+
+
+
+class TaskResult(NamedTuple):
+    """
+    Outcome of processing one file in a worker process.
+    """
+
+    path : Path
+    status : str
+    size : int
+    detail : str = ''
+
+
+
+def main(argv : Sequence[str] | None = None) -> int:
+    """
+    Runs the command line interface.
+
+
+    Parameters
+    ----------
+    argv : Sequence[str] | None, default = None
+        Command line arguments, None to use `sys.argv`.
+
+
+    Returns
+    -------
+    int
+        The exit status, 1 if any file failed and 0 otherwise.
+    """
+
+    start = time.perf_counter()
+    args = _build_parser().parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print('no input files found', file=sys.stderr)
+        return 1
+
+    match args.command:
+        case 'convert':
+            outputs = {
+                path : output_path(path, args.to, args.output_dir, relative_dir)
+                for path, relative_dir in paths.items()
+                if path.suffix != f'.{args.to}'
+            }
+            claims = collections.Counter(outputs.values())
+
+            tasks = []
+            skipped = []
+            for path in paths:
+                output = outputs.get(path)
+                if output is None:
+                    # includes the outputs of earlier runs, when they are
+                    # found among the inputs
+                    skipped.append(TaskResult(path, 'skipped', 0, f'already {args.to}'))
+                elif claims[output] > 1:
+                    skipped.append(TaskResult(
+                        path, 'failed', 0, f'{output} would be written by several inputs'
+                    ))
+                elif not args.force and is_up_to_date(path, output):
+                    skipped.append(TaskResult(path, 'skipped', 0, f'{output} is up to date'))
+                else:
+                    tasks.append((convert_file, path, output, args.to))
+
+            if args.dry_run:
+                for _, path, output, _ in tasks:
+                    print(f'would convert {path} -> {output}')
+                for result in skipped:
+                    if result.status == 'failed':
+                        _report(result, args.quiet)
+                    else:
+                        print(f'would skip {result.path}: {result.detail}')
+                return 1 if any(result.status == 'failed' for result in skipped) else 0
+
+        case 'validate':
+            tasks = [(validate_file, path) for path in paths]
+            skipped = []
+
+        case 'stat':
+            tasks = [(stat_file, path) for path in paths]
+            skipped = []
+
+    for result in skipped:
+        _report(result, args.quiet)
+    results = skipped + _run(tasks, args.jobs, args.quiet)
+    _print_summary(results, args.command, time.perf_counter() - start)
+    return 1 if any(result.status == 'failed' for result in results) else 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Returns the argument parser for the command line interface.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog = 'pyfilehandlers',
+        description = 'Convert, validate and inspect data files in bulk.'
+    )
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    convert = commands.add_parser('convert', help = 'convert files to another format')
+    convert.add_argument('--to', required = True, choices = OUTPUT_FORMATS,
+                         help = 'format to convert to')
+    convert.add_argument('-o', '--output-dir', type = Path,
+                         help = 'directory for converted files, defaults to '
+                                'alongside each input')
+    convert.add_argument('--dry-run', action = 'store_true',
+                         help = 'list conversions without performing them')
+    convert.add_argument('--force', action = 'store_true',
+                         help = 'convert even if the output is newer than the input')
+
+    commands.add_parser('validate', help = 'check that files parse')
+    commands.add_parser('stat', help = 'report size, records and parse time of files')
+
+    for command in commands.choices.values():
+        command.add_argument('inputs', nargs = '+',
+                             help = 'files, glob patterns or directories')
+        command.add_argument('-j', '--jobs', type = int, default = os.cpu_count(),
+                             help = 'number of worker processes')
+        command.add_argument('-q', '--quiet', action = 'store_true',
+                             help = 'only report failures and the summary')
+
+    return parser
+
+
+def expand_inputs(inputs : Sequence[str]) -> dict[Path, Path]:
+    """
+    Expands files, glob patterns and directories into the files with
+    supported extensions. Directories are searched recursively.
+
+
+    Parameters
+    ----------
+    inputs : Sequence[str]
+        The files, glob patterns and directories.
+
+
+    Returns
+    -------
+    dict[pathlib.Path, pathlib.Path]
+        The absolute paths of the files, without duplicates, in order.
+        Each is mapped to its directory relative to the input it was found
+        through: the directory searched, or the directory a glob pattern
+        starts from.
+    """
+
+    paths : dict[Path, Path] = {}
+    for pattern in inputs:
+        root = _pattern_root(pattern)
+        matches = glob.glob(pattern, recursive = True) or [pattern]
+        for match in map(Path, matches):
+            if match.is_dir():
+                candidates = sorted(match.rglob('*'))
+            else:
+                candidates = [match]
+
+            for candidate in candidates:
+                if candidate.is_file() and candidate.suffix in INPUT_SUFFIXES:
+                    paths.setdefault(
+                        candidate.resolve(),
+                        Path(os.path.relpath(candidate.absolute().parent, root))
+                    )
+
+    return paths
+
+
+def _pattern_root(pattern : str) -> Path:
+    """
+    Returns the absolute directory an input starts from: the directory
+    itself, a file's directory, or the part of a glob pattern before its
+    first wildcard.
+    """
+
+    root = Path()
+    for part in Path(pattern).parts:
+        if glob.has_magic(part):
+            break
+        root /= part
+
+    root = root.absolute()
+    return root if root.is_dir() else root.parent
+
+
+def output_path(
+    path : Path,
+    output_format : str,
+    output_dir : Path | None,
+    relative_dir : Path = Path()
+) -> Path:
+    """
+    Returns the path a file is converted to. Under `output_dir`, the file
+    keeps its directory relative to the input it was found through, so
+    that files of the same name in different directories stay apart.
+    """
+
+    if output_dir is None:
+        directory = path.parent
+    else:
+        directory = output_dir.resolve() / relative_dir
+    return directory / f'{path.stem}.{output_format}'
+
+
+def is_up_to_date(path : Path, output : Path) -> bool:
+    """
+    Determines if a converted file exists and is newer than its input.
+    """
+
+    try:
+        return output.stat().st_mtime_ns >= path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def load_file(path : Path) -> Any:
+    """
+    Reads a file into Python data, without creating it if it is missing.
+
+    Multi-document YAML files are returned as a list of their documents,
+    text files as a list of lines without newlines, and Minecraft dat files
+    as their `amulet_nbt.NamedTag`.
+
+
+    Raises
+    ------
+    ValueError
+        If the file could not be read or parsed.
+    """
+
+    handler = FileHandler(path, create = False)
+    if not handler.file_exists():
+        raise ValueError('file does not exist')
+    if handler.is_empty():
+        return None
+
+    if isinstance(handler.extension, YAMLFile):
+        documents = list(handler.extension.iter_documents())
+        return documents[0] if len(documents) == 1 else documents
+
+    data = handler.read()
+    if data is None:
+        raise ValueError('file could not be parsed')
+
+    if isinstance(handler.extension, TxtFile):
+        return [line.rstrip('\n') for line in data]
+    return data
+
+
+def nbt_to_python(tag : Any) -> Any:
+    """
+    Converts an NBT tag into plain Python data that JSON can represent.
+    """
+
+    if isinstance(tag, amulet_nbt.NamedTag):
+        tag = tag.tag
+    if isinstance(tag, amulet_nbt.CompoundTag):
+        return {key : nbt_to_python(value) for key, value in tag.items()}
+    if isinstance(tag, amulet_nbt.ListTag):
+        return [nbt_to_python(item) for item in tag]
+
+    data = tag.py_data
+    if hasattr(data, 'tolist'):
+        return data.tolist()
+    return data
+
+
+def convert_file(path : Path, output : Path, output_format : str) -> int:
+    """
+    Converts a file into another format.
+
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Absolute path of the file to convert.
+
+    output : pathlib.Path
+        Absolute path of the file to write.
+
+    output_format : str
+        One of `OUTPUT_FORMATS`.
+
+
+    Returns
+    -------
+    int
+        The size of the input file, in bytes.
+
+
+    Raises
+    ------
+    ValueError
+        If the file could not be read, converted or written.
+    """
+
+    data = load_file(path)
+    is_nbt = path.suffix == '.dat'
+    output.parent.mkdir(parents = True, exist_ok = True)
+
+    if output_format == 'snbt':
+        if not is_nbt:
+            raise ValueError('only NBT files can be converted to SNBT')
+        saved = TxtFile(output).write(data.to_snbt())
+
+    else:
+        if is_nbt:
+            data = nbt_to_python(data)
+
+        if output_format in ('jsonl', 'txt') and not isinstance(data, list):
+            data = [] if data is None else [data]
+        if output_format == 'txt':
+            data = [
+                item if isinstance(item, str)
+                else json.dumps(item, ensure_ascii=False)
+                for item in data
+            ]
+
+        saved = FileHandler(output, create = False, atomic_writes = True).write(data)
+
+    if not saved:
+        raise ValueError(f'could not write {output}')
+    return path.stat().st_size
+
+
+def validate_file(path : Path) -> int:
+    """
+    Checks that a file parses.
+
+
+    Returns
+    -------
+    int
+        The size of the file, in bytes.
+
+
+    Raises
+    ------
+    ValueError
+        If the file could not be read or parsed.
+    """
+
+    load_file(path)
+    return path.stat().st_size
+
+
+def stat_file(path : Path) -> tuple[int, str]:
+    """
+    Parses a file and describes it.
+
+
+    Returns
+    -------
+    tuple[int, str]
+        The size of the file in bytes, and a description of its format,
+        number of records and parse time.
+
+
+    Raises
+    ------
+    ValueError
+        If the file could not be read or parsed.
+    """
+
+    start = time.perf_counter()
+    data = load_file(path)
+    elapsed = time.perf_counter() - start
+
+    if isinstance(data, (list, dict)):
+        records = f'{len(data)} records'
+    elif data is None:
+        records = 'empty'
+    else:
+        records = type(data).__name__
+
+    size = path.stat().st_size
+    return size, f'{path.suffix[1:]}, {size} bytes, {records}, parsed in {elapsed:.3f} s'
+
+
+def _run_task(function : Any, *args : Any) -> TaskResult:
+    """
+    Runs one task in a worker process, turning any error, including the
+    messages file extensions print when they fail to parse, into a failed
+    result rather than a crash or a prompt.
+    """
+
+    path = args[0]
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured):
+            outcome = function(*args)
+
+    except Exception as e:
+        messages = captured.getvalue().replace(CONTINUE_PROMPT, '')
+        detail = ' '.join(messages.split())
+        return TaskResult(path, 'failed', 0, f'{e} {detail}'.strip())
+
+    if isinstance(outcome, tuple):
+        return TaskResult(path, 'ok', *outcome)
+    return TaskResult(path, 'ok', outcome)
+
+
+def _init_worker() -> None:
+    """
+    Detaches a worker process from standard input, so that error handling
+    which waits for the user to press Enter fails fast instead.
+    """
+    sys.stdin = open(os.devnull)
+
+
+def _run(tasks : list[tuple], jobs : int | None, quiet : bool) -> list[TaskResult]:
+    """
+    Runs tasks across a process pool, reporting each as it finishes.
+    """
+
+    results = []
+    if not tasks:
+        return results
+
+    with ProcessPoolExecutor(max_workers = jobs, initializer = _init_worker) as executor:
+        futures = [executor.submit(_run_task, *task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), start = 1):
+            result = future.result()
+            results.append(result)
+            _report(result, quiet, f'[{done}/{len(tasks)}] ')
+
+    return results
+
+
+def _report(result : TaskResult, quiet : bool, prefix : str = '') -> None:
+    """
+    Prints the outcome of one file, failures to standard error.
+    """
+
+    if result.status == 'failed':
+        print(f'{prefix}failed {result.path}: {result.detail}', file = sys.stderr)
+    elif not quiet:
+        print(f'{prefix}{result.status} {result.path}'
+              + (f': {result.detail}' if result.detail else ''))
+
+
+def _print_summary(
+    results : list[TaskResult], 
+    command : str, 
+    elapsed : float
+) -> None:
+    """
+    Prints the number of files processed, skipped and failed, and the
+    throughput of the run.
+    """
+
+    counts = {status : 0 for status in ('ok', 'skipped', 'failed')}
+    for result in results:
+        counts[result.status] += 1
+    total_bytes = sum(result.size for result in results)
+
+    print(
+        f'{command}: {counts["ok"]} ok, {counts["skipped"]} skipped, '
+        f'{counts["failed"]} failed in {elapsed:.2f} s '
+        f'({counts["ok"] / elapsed:.1f} files/s, '
+        f'{total_bytes / elapsed / 2**20:.2f} MiB/s)'
+    )
@@ -0,0 +1,165 @@
+"""file_copy.py
+
+Contains functions that copy files without passing their contents
+through user space, where the platform allows it.
+"""
+
+import errno
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl is POSIX only, reflinks are unavailable elsewhere
+    fcntl = None
+
+from .file_writer import _commit_temp_file, _create_temp_file
+
+
+from typing import BinaryIO, Callable
+
+
+COPY_CHUNK_SIZE = 1 << 30
+FALLBACK_CHUNK_SIZE = 1 << 20
+
+# errors meaning a copy method is unsupported here, rather than a failure
+UNSUPPORTED_ERRNOS = frozenset({
+    errno.ENOSYS, errno.ENOTTY, errno.EINVAL, errno.EXDEV,
+    errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM,
+})
+
+
+
+def copy_file(source : Path, destination : Path) -> str:
+    """
+    Copies a file, atomically replacing the destination.
+
+    The fastest available method is used: a reflink that shares the
+    source's blocks on copy-on-write filesystems, then `copy_file_range`
+    and `sendfile`, which copy inside the kernel, and finally an ordinary
+    buffered copy. The copy is written to a temporary file next to the
+    destination, given the source's mode, synced to disk and renamed over
+    the destination, so the destination is never partial.
+
+
+    Parameters
+    ----------
+    source : pathlib.Path
+        Path of the file to copy.
+
+    destination : pathlib.Path
+        Path to copy the file to.
+
+
+    Returns
+    -------
+    str
+        The method used, one of 'reflink', 'copy_file_range', 'sendfile'
+        or 'read'.
+    """
+
+    fd, temp_path = _create_temp_file(destination)
+
+    try:
+        with open(fd, 'wb') as dst, open(source, 'rb') as src:
+            method = _copy_contents(src, dst)
+        _commit_temp_file(temp_path, destination, mode_source = source)
+
+    except BaseException:
+        temp_path.unlink(missing_ok = True)
+        raise
+
+    return method
+
+
+def _copy_contents(src : BinaryIO, dst : BinaryIO) -> str:
+    """
+    Copies the rest of one open file into another, trying each copy method
+    in turn. Each method continues from where the previous one stopped.
+
+
+    Returns
+    -------
+    str
+        The method that finished the copy.
+    """
+
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+
+    if _reflink(src_fd, dst_fd):
+        return 'reflink'
+
+    if hasattr(os, 'copy_file_range') and _copy_in_kernel(os.copy_file_range, src_fd, dst_fd):
+        return 'copy_file_range'
+
+    if hasattr(os, 'sendfile') and _copy_in_kernel(_sendfile, src_fd, dst_fd):
+        return 'sendfile'
+
+    src.seek(os.lseek(src_fd, 0, os.SEEK_CUR))
+    dst.seek(os.lseek(dst_fd, 0, os.SEEK_CUR))
+    shutil.copyfileobj(src, dst, FALLBACK_CHUNK_SIZE)
+    return 'read'
+
+
+def _reflink(src_fd : int, dst_fd : int) -> bool:
+    """
+    Clones a whole file with the `FICLONE` ioctl.
+
+
+    Returns
+    -------
+    bool
+        True,  if the file was cloned.
+        False, if the filesystem or platform does not support it.
+    """
+
+    if fcntl is None or not hasattr(fcntl, 'FICLONE'):
+        return False
+
+    try:
+        fcntl.ioctl(dst_fd, fcntl.FICLONE, src_fd)
+        return True
+
+    except OSError as e:
+        if e.errno in UNSUPPORTED_ERRNOS:
+            return False
+        raise
+
+
+def _sendfile(src_fd : int, dst_fd : int, count : int) -> int:
+    """
+    Calls `os.sendfile`, with the arguments ordered as for
+    `os.copy_file_range`.
+    """
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def _copy_in_kernel(
+    copy : Callable[[int, int, int], int],
+    src_fd : int,
+    dst_fd : int
+) -> bool:
+    """
+    Copies the rest of a file with a kernel copy call such as
+    `os.copy_file_range`, advancing both files' positions.
+
+
+    Returns
+    -------
+    bool
+        True,  if the copy completed.
+        False, if the call is unsupported for these files.
+    """
+
+    try:
+        while copy(src_fd, dst_fd, COPY_CHUNK_SIZE):
+            pass
+        return True
+
+    except OSError as e:
+        if e.errno in UNSUPPORTED_ERRNOS:
+            return False
+        raise
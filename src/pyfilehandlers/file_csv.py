@@ -0,0 +1,380 @@
+"""file_csv.py
+
+Contains a class that handles CSV and TSV file IO.
+"""
+
+import csv
+import itertools
+import math
+from array import array
+from pathlib import Path
+
+from lunapyutils import handle_error
+
+from .file_extension import FileExtension
+from .file_writer import WriterSession
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+
+WRITE_BATCH_SIZE = 10_000
+
+# column kinds, from most to least specific, named by their array typecode
+INT_COLUMN = 'q'
+FLOAT_COLUMN = 'd'
+STR_COLUMN = 'str'
+
+# range of values an array('q') can hold
+INT_COLUMN_MIN = -2**63
+INT_COLUMN_MAX = 2**63 - 1
+
+
+
+class CSVFile(FileExtension):
+    """
+    Class that handles CSV and TSV file IO.
+
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Absolute path of the file to be managed.
+
+    delimiter : str
+        The character separating fields, a tab for `.tsv` files and a
+        comma otherwise.
+    """
+
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initializes CSVFile instance.
+
+
+        Attributes
+        ----------
+        path : pathlib.Path
+            Absolute path of the file to be managed.
+        """
+
+        is_tsv = path.suffix == '.tsv'
+        super().__init__(
+            path = path,
+            extension_suffix = '.tsv' if is_tsv else '.csv'
+        )
+        self.delimiter = '\t' if is_tsv else ','
+
+
+    def read(self) -> list[list[str]] | None:
+        """
+        Opens CSV file and returns its rows.
+
+
+        Returns
+        -------
+        list[list[str]]
+            The rows contained in the file, including any header row.
+            None, if there was an error.
+        """
+
+        data = None
+        try:
+            data = list(self.iter_rows())
+
+        except IOError as e:
+            handle_error(e, 'CSVFile.open()',
+                         'error opening file')
+
+        except Exception as e:
+            handle_error(e, 'CSVFile.open()',
+                         'erroneous error opening file')
+
+        finally:
+            return data
+
+
+    def iter_rows(self) -> Iterator[list[str]]:
+        """
+        Opens CSV file and yields its rows one at a time, so that only
+        one row is held in memory.
+
+
+        Yields
+        ------
+        list[str]
+            The next row in the file.
+        """
+
+        with open(self.path, 'r', newline='') as f:
+            yield from csv.reader(f, delimiter = self.delimiter)
+
+
+    def write(self, data: Iterable[Sequence[Any]]) -> bool:
+        """
+        Writes rows to CSV file. Overwrites all data held in file.
+
+        Rows are consumed lazily and written in batches, so `data` may be
+        a generator producing more rows than fit in memory.
+
+
+        Parameters
+        ----------
+        data : Iterable[Sequence[Any]]
+            The rows to write to the file.
+
+
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file.
+            False, otherwise.
+        """
+
+        saved = False
+        try:
+            with open(self.path, 'w', newline='') as f:
+                writer = csv.writer(f, delimiter = self.delimiter)
+                for batch in itertools.batched(data, WRITE_BATCH_SIZE):
+                    writer.writerows(batch)
+                saved = True
+
+        except Exception as e:
+            handle_error(e, 'CSVFile.write()', 'error writing to file')
+
+        finally:
+            return saved
+
+
+    def open_writer(
+        self,
+        on_close : Callable[[], None] | None = None
+    ) -> 'CSVWriter':
+        """
+        Opens a session that writes the CSV file row by row.
+
+
+        Parameters
+        ----------
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+
+
+        Returns
+        -------
+        CSVWriter
+            The session, which replaces the file when closed.
+        """
+        return CSVWriter(self.path, self.delimiter, on_close = on_close)
+
+
+    def read_columns(
+        self,
+        header : bool = True,
+        use_numpy : bool = False
+    ) -> dict[str, Any] | None:
+        """
+        Opens CSV file and returns its data by column, with each column's
+        type inferred from its values.
+
+        Integer columns are stored in `array('q')` and float columns in
+        `array('d')`, taking 8 bytes per value rather than a Python object
+        per value. Empty fields in float columns become NaN. Any other
+        column is kept as a list of strings. Blank lines are skipped. The
+        file is read twice, once to infer column types and once to load
+        them.
+
+
+        Parameters
+        ----------
+        header : bool, default = True
+            True,  if the first row holds the column names.
+            False, to name columns by their index.
+
+        use_numpy : bool, default = False
+            True,  to return numeric columns as NumPy arrays sharing the
+                   memory of the `array.array` they were loaded into.
+            False, to return numeric columns as `array.array`.
+
+
+        Returns
+        -------
+        dict[str, array.array | numpy.ndarray | list[str]]
+            The columns of the file, in order, keyed by column name.
+            None, if there was an error.
+
+
+        Raises
+        ------
+        ImportError
+            If `use_numpy` is True and NumPy is not installed.
+        """
+
+        if use_numpy and numpy is None:
+            raise ImportError('NumPy is required for use_numpy=True')
+
+        columns = None
+        try:
+            names, kinds = self._infer_column_kinds(header)
+            values = [
+                list() if kind == STR_COLUMN else array(kind) for kind in kinds
+            ]
+            parsers = [_COLUMN_PARSERS[kind] for kind in kinds]
+
+            rows = filter(None, self.iter_rows())
+            if header:
+                next(rows, None)
+            for row in rows:
+                for column, parse, field in zip(values, parsers, row):
+                    column.append(parse(field))
+
+            if use_numpy:
+                values = [
+                    column if kind == STR_COLUMN
+                    else numpy.frombuffer(column, dtype=column.typecode)
+                    for column, kind in zip(values, kinds)
+                ]
+            columns = dict(zip(names, values))
+
+        except IOError as e:
+            handle_error(e, 'CSVFile.read_columns()',
+                         'error opening file')
+
+        except Exception as e:
+            handle_error(e, 'CSVFile.read_columns()',
+                         'erroneous error opening file')
+
+        finally:
+            return columns
+
+
+    def _infer_column_kinds(self, header : bool) -> tuple[list[str], list[str]]:
+        """
+        Reads through the file to find the most specific type that holds
+        every value of each column. Integers outside the 64-bit range make
+        their column a float column. Blank lines are skipped.
+
+
+        Parameters
+        ----------
+        header : bool
+            True,  if the first row holds the column names.
+            False, to name columns by their index.
+
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            The name and kind of each column.
+
+
+        Raises
+        ------
+        ValueError
+            If a row has a different number of fields than the first row.
+        """
+
+        rows = filter(None, self.iter_rows())
+        first = next(rows, [])
+        names = first if header else [str(i) for i in range(len(first))]
+        kinds = [INT_COLUMN] * len(first)
+        if not header:
+            rows = itertools.chain([first], rows)
+
+        for line, row in enumerate(rows, start = 2 if header else 1):
+            if len(row) != len(kinds):
+                raise ValueError(
+                    f'Row {line} has {len(row)} fields, expected {len(kinds)}'
+                )
+
+            for i, field in enumerate(row):
+                kind = kinds[i]
+                if kind == INT_COLUMN:
+                    try:
+                        if INT_COLUMN_MIN <= int(field) <= INT_COLUMN_MAX:
+                            continue
+                    except ValueError:
+                        pass
+                    kind = kinds[i] = FLOAT_COLUMN
+                if kind == FLOAT_COLUMN:
+                    try:
+                        _parse_float(field)
+                    except ValueError:
+                        kinds[i] = STR_COLUMN
+
+        return names, kinds
+
+
+
+class CSVWriter(WriterSession):
+    """
+    Writes a CSV file row by row.
+    """
+
+
+    def __init__(
+        self,
+        path : Path,
+        delimiter : str = ',',
+        on_close : Callable[[], None] | None = None
+    ) -> None:
+        """
+        Initializes CSVWriter instance.
+
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            Absolute path of the file to write.
+
+        delimiter : str, default = ','
+            The character separating fields.
+
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+        """
+
+        self._delimiter = delimiter
+        super().__init__(path, newline = '', on_close = on_close)
+
+
+    def _begin(self) -> None:
+        self._writer = csv.writer(self._file, delimiter = self._delimiter)
+
+
+    def write_row(self, row : Sequence[Any]) -> None:
+        """
+        Writes a row.
+        """
+
+        self._check_open()
+        self._writer.writerow(row)
+
+
+    def write_rows(self, rows : Iterable[Sequence[Any]]) -> None:
+        """
+        Writes each row.
+        """
+
+        self._check_open()
+        self._writer.writerows(rows)
+
+
+
+def _parse_float(field : str) -> float:
+    """
+    Parses a float field, where an empty field is a missing value.
+    """
+    return float(field) if field else math.nan
+
+
+_COLUMN_PARSERS = {
+    INT_COLUMN   : int,
+    FLOAT_COLUMN : _parse_float,
+    STR_COLUMN   : str,
+}
@@ -8,7 +8,9 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 
 
-from typing import Any
+from typing import Any, Callable
+
+from .file_writer import WriterSession
 
 
 
@@ -65,6 +67,30 @@ class FileExtension(ABC):
         pass
 
 
+    def open_writer(
+        self, 
+        on_close : Callable[[], None] | None = None
+    ) -> WriterSession:
+        """
+        Opens a session that writes the file incrementally.
+
+
+        Parameters
+        ----------
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+
+
+        Raises
+        ------
+        NotImplementedError
+            If the file format does not support incremental writes.
+        """
+        raise NotImplementedError(
+            f'{type(self).__name__} does not support incremental writes'
+        )
+
+
     def print(self) -> None:
         """
         Opens the file and prints the data held within.
@@ -3,22 +3,65 @@
 Contains class that handles a single file.
 """
 
+import errno
+import functools
+import hashlib
+import os
+import threading
+import weakref
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from lunapyutils import handle_error, print_internal
 
+from .file_copy import copy_file
 from .file_extension import FileExtension
+from .file_lock import ReadWriteLock, file_lock, lock_path_for
+from .file_writer import WriterSession, _commit_temp_file, _create_temp_file
 from .file_dat import DatFile
 from .file_minecraft_dat import MinecraftDatFile
 from .file_txt import TxtFile
-from .file_json import JSONFile
+from .file_json import JSONFile, _discard_journal
+from .file_jsonl import JSONLinesFile
 from .file_yaml import YAMLFile
+from .file_csv import CSVFile
 
 
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Self
 
 
 SCRIPT_ROOT = Path.cwd()
+RESOLVED_PATH_CACHE_SIZE = 1 << 16
+DEFAULT_CHUNK_SIZE = 1 << 20
+SNAPSHOT_DIRECTORY = '.snapshots'
+SNAPSHOT_TIME_FORMAT = '%Y%m%dT%H%M%S%fZ'
+DEFAULT_SNAPSHOTS_KEPT = 10
+
+
+
+class FileState(NamedTuple):
+    """
+    Identifies one version of a file's contents by its stat data.
+
+    Used with `FileHandler.write_if_unchanged()` to detect whether
+    another writer has changed the file since it was last read.
+    """
+
+    inode : int
+    size : int
+    mtime_ns : int
+    ctime_ns : int
+
+
+
+@functools.lru_cache(maxsize=RESOLVED_PATH_CACHE_SIZE)
+def _resolve_relative_path(given_path : Path, cwd : str) -> Path:
+    """
+    Resolves a relative path against a working directory, caching the
+    result since resolving touches the filesystem once per component.
+    """
+    return Path(cwd, given_path).resolve()
 
 
 
@@ -34,19 +77,39 @@ class FileHandler:
 
     extension : FileExtension
         Handles file IO based on extension type.
+
+    locking : bool
+        Whether reads and writes take advisory locks that other
+        processes respect.
+
+    atomic_writes : bool
+        Whether writes replace the file atomically, letting reads
+        skip locking entirely.
+
+    lock_timeout : float | None
+        Seconds to wait for a lock before giving up, None waits forever.
     """
 
+    # handlers interned by resolved path, see `FileHandler.intern()`
+    _registry : weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+    _registry_lock = threading.Lock()
+
 
     def __init__(
         self, 
-        file_path : Path
+        file_path : Path,
+        create : bool = True,
+        locking : bool = False,
+        atomic_writes : bool = False,
+        lock_timeout : float | None = 10.0
     ) -> None:
         """
         Initializes a FileHandler instance.
 
         Either provide a relative or absolute `pathlib.Path` path for the file. 
         Relative paths with be rooted at the current working directory where
-        the script was run. If the file does not exist, it will be created.
+        the script was run. If the file does not exist, it will be created,
+        unless `create` is False, in which case it is created on first write.
 
         
         Parameters
@@ -55,6 +118,25 @@ class FileHandler:
             The relative or absolute path of the file to be managed, 
             including extension.
 
+        create : bool, default = True
+            True,  to create the file now if it does not exist.
+            False, to leave the filesystem untouched until the first write.
+
+        locking : bool, default = False
+            True,  to guard reads with shared and writes with exclusive
+                   `fcntl` locks, for files shared between processes.
+            False, otherwise.
+
+        atomic_writes : bool, default = False
+            True,  to write to a temporary file and rename it over the
+                   file, so readers never see a partial write and do not
+                   need to lock.
+            False, to write to the file in place.
+
+        lock_timeout : float | None, default = 10.0
+            Seconds to wait for a lock before raising `TimeoutError`,
+            None waits forever.
+
             
         Raises
         ------
@@ -64,8 +146,12 @@ class FileHandler:
 
         self.path : Path = self._resolve_path(file_path)
         self.extension : FileExtension = self._determine_file_extension_object()(self.path)
+        self.locking = locking
+        self.atomic_writes = atomic_writes
+        self.lock_timeout = lock_timeout
+        self._rw_lock = ReadWriteLock()
             
-        if not self.file_exists():
+        if create and not self.file_exists():
             if self.create_file():
                 print_internal(f'{self.path} created successfully')
             else:
@@ -76,7 +162,8 @@ class FileHandler:
     def from_directory_and_filename(
         cls,
         filename : str, 
-        directory : str = 'data'
+        directory : str = 'data',
+        create : bool = True
     ) -> None:
         """
         Initializes a FileHandler instance.
@@ -93,12 +180,117 @@ class FileHandler:
 
         directory : str, default = 'data'
             The name of the directory to put the file in.
+
+        create : bool, default = True
+            True,  to create the file now if it does not exist.
+            False, to leave the filesystem untouched until the first write.
         """
         return cls(
-            file_path = Path(SCRIPT_ROOT, directory, filename)
+            file_path = Path(SCRIPT_ROOT, directory, filename),
+            create = create
         )
 
 
+    @classmethod
+    def intern(cls, file_path : Path, **kwargs : Any) -> Self:
+        """
+        Returns the single FileHandler for a path, constructing it only if
+        no live handler for the same resolved path exists.
+
+        Sharing one handler per path also shares its FileExtension and its
+        in-process lock, so threads using the same file stay coordinated.
+        Options in `kwargs` only apply when the handler is first created.
+
+        
+        Parameters
+        ----------
+        file_path : pathlib.Path
+            The relative or absolute path of the file to be managed, 
+            including extension.
+
+        **kwargs : Any
+            Options passed to `FileHandler()` if a handler is created.
+
+
+        Returns
+        -------
+        FileHandler
+            The handler for the resolved path.
+
+
+        Raises
+        ------
+        ValueError
+            If the file does not have a FileExtension subclass to handle it.
+        """
+
+        # resolved even when absolute, so that paths through `..` or
+        # symlinks share the handler of the file they lead to
+        path = cls._resolve_path(file_path).resolve()
+        with cls._registry_lock:
+            handler = cls._registry.get(path)
+            if handler is None:
+                handler = cls(path, **kwargs)
+                cls._registry[path] = handler
+            return handler
+
+
+    @classmethod
+    def bulk(
+        cls,
+        file_paths : Iterable[Path],
+        create : bool = True,
+        **kwargs : Any
+    ) -> list[Self]:
+        """
+        Returns interned FileHandlers for many paths at once.
+
+        When creating files, each distinct parent directory is created at
+        most once, and files are created without per-file messages.
+
+        
+        Parameters
+        ----------
+        file_paths : Iterable[pathlib.Path]
+            The relative or absolute paths of the files to be managed, 
+            including extension.
+
+        create : bool, default = True
+            True,  to create any files that do not exist.
+            False, to leave the filesystem untouched until the first write.
+
+        **kwargs : Any
+            Options passed to `FileHandler()` for each handler created.
+
+
+        Returns
+        -------
+        list[FileHandler]
+            The handlers, in the same order as `file_paths`.
+
+
+        Raises
+        ------
+        ValueError
+            If a file does not have a FileExtension subclass to handle it.
+        """
+
+        paths = [cls._resolve_path(file_path) for file_path in file_paths]
+
+        if create:
+            for directory in {path.parent for path in paths}:
+                cls.create_dir(directory)
+
+            for path in paths:
+                try:
+                    os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o666))
+                except OSError as e:
+                    handle_error(e, 'FileHandler.bulk()', 
+                                 'error creating file')
+
+        return [cls.intern(path, create = False, **kwargs) for path in paths]
+
+
     def _determine_file_extension_object(self) -> FileExtension:
         """
         Determines the appropriate FileExtension subclass to use for this file.
@@ -120,6 +312,8 @@ class FileHandler:
             case '.txt'  : return TxtFile
             case '.yaml' : return YAMLFile
             case '.json' : return JSONFile
+            case '.jsonl' : return JSONLinesFile
+            case '.csv' | '.tsv' : return CSVFile
             case '.dat'  : return self._determine_dat_file_subclass()
             case _: raise ValueError('No FileExtension for given extension')
 
@@ -148,9 +342,12 @@ class FileHandler:
         return MinecraftDatFile
 
     
-    def _resolve_path(self, given_path : Path) -> Path:
+    @staticmethod
+    def _resolve_path(given_path : Path) -> Path:
         """
         Returns an absolute path to a file.
+
+        Resolved relative paths are cached per working directory.
         
 
         Parameters
@@ -165,10 +362,11 @@ class FileHandler:
             The absolute path of the file.
         """
 
+        given_path = Path(given_path)
         if given_path.is_absolute():
             return given_path
         
-        return given_path.resolve()
+        return _resolve_relative_path(given_path, os.getcwd())
 
 
     @staticmethod
@@ -269,33 +467,147 @@ class FileHandler:
         return self.path.stat().st_size == 0
     
 
-    def read(self) -> Any | None:
+    @contextmanager
+    def _locked(self, shared : bool) -> Iterator[None]:
+        """
+        Holds the locks needed to read or write the file.
+
+        Threads sharing this handler are coordinated with an in-process
+        reader-writer lock, other processes with an `fcntl` lock if
+        `locking` is enabled. Reads of atomically written files take no
+        lock at all, since they always see a complete version of the file.
+
+
+        Parameters
+        ----------
+        shared : bool
+            True,  if the file is being read.
+            False, if the file is being written.
+
+
+        Raises
+        ------
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        if shared and self.atomic_writes:
+            yield
+            return
+
+        if shared:
+            thread_lock = self._rw_lock.read_locked(self.lock_timeout)
+        else:
+            thread_lock = self._rw_lock.write_locked(self.lock_timeout)
+
+        with thread_lock:
+            if self.locking:
+                with file_lock(self.path, shared, self.lock_timeout):
+                    yield
+            else:
+                yield
+
+
+    def file_state(self) -> FileState:
+        """
+        Returns the stat data identifying the file's current contents.
+
+        
+        Returns
+        -------
+        FileState
+            The inode, size and modification times of the file.
+        """
+
+        stat = self.path.stat()
+        return FileState(
+            stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+        )
+
+
+    def file_digest(self) -> str:
+        """
+        Returns a SHA-256 digest of the file's current contents.
+
+        
+        Returns
+        -------
+        str
+            The hex digest of the file.
+        """
+
+        with open(self.path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+    def read(self, schema : Any = None, compact : bool = False) -> Any | None:
         """
         Opens file and returns its data.
 
         
+        Parameters
+        ----------
+        schema : Any, default = None
+            For JSON and YAML files, a dataclass, NamedTuple or generic
+            such as `list[Record]` to decode the data into.
+            None, to return the data as parsed.
+
+        compact : bool, default = False
+            For txt files, return the lines as a `LineStore`, which holds
+            them in a single buffer instead of one string per line.
+
+
         Returns
         -------
         Any
             The data held in the file.
-            None, if file is empty.
+            None, if file is empty, or does not exist yet because the
+            handler was created with `create=False`.
 
         Raises
         ------
         PermissionError
             If process does not have the permission to read from the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+
+        TypeError
+            If `schema` is given for a file other than JSON or YAML, or
+            `compact` for a file other than txt.
+
+        ValueError
+            If both `schema` and `compact` are given.
+
+        schema.SchemaError
+            If the data does not match the schema.
         """
 
-        try:
-            open(self.path, mode='r')
-        
-        except PermissionError:
-            raise PermissionError(f'Lacking permissions to read from file {self.path}')
+        if schema is not None and compact:
+            raise ValueError('A file can not be read both with a schema and compact')
+        if schema is not None and not isinstance(self.extension, (JSONFile, YAMLFile)):
+            raise TypeError(f'Reading with a schema requires a JSON or YAML file, not {self.path.name}')
+        if compact and not isinstance(self.extension, TxtFile):
+            raise TypeError(f'Compact reads require a txt file, not {self.path.name}')
 
-        else:
-            if self.is_empty():
+        with self._locked(shared=True):
+            try:
+                open(self.path, mode='r').close()
+
+            except FileNotFoundError:
                 return None
-            return self.extension.read()
+            
+            except PermissionError:
+                raise PermissionError(f'Lacking permissions to read from file {self.path}')
+
+            else:
+                if self.is_empty():
+                    return None
+                if schema is not None:
+                    return self.extension.read(schema = schema)
+                if compact:
+                    return self.extension.read(compact = True)
+                return self.extension.read()
     
 
     def write(self, data: Any) -> bool:
@@ -303,6 +615,143 @@ class FileHandler:
         Writes data to file.
 
         
+        Parameters
+        ----------
+        data : Any
+            Data to write to the file.
+
+        
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file successfully.
+            False, otherwise.
+
+
+        Raises
+        ------
+        PermissionError
+            If process does not have the permission to write to the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        self._ensure_parent_dir()
+        with self._locked(shared=False):
+            return self._write_unlocked(data)
+
+
+    def write_if_unchanged(
+        self, 
+        data : Any, 
+        expected : FileState | str
+    ) -> bool:
+        """
+        Writes data to file only if the file has not changed since it was
+        read, as a compare-and-swap.
+
+        Read the file along with `file_state()` or `file_digest()`, modify
+        the data, then pass the data and the state or digest back here.
+        The check and the write happen under an exclusive lock, so
+        concurrent read-modify-write cycles never lose an update, while
+        only being serialized for the duration of the write itself.
+
+        
+        Parameters
+        ----------
+        data : Any
+            Data to write to the file.
+
+        expected : FileState | str
+            The `file_state()` or `file_digest()` taken when the file was
+            read. A digest also detects changes that leave the stat data
+            untouched, at the cost of hashing the file.
+
+        
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file successfully.
+            False, if the file changed or the write failed.
+
+
+        Raises
+        ------
+        PermissionError
+            If process does not have the permission to write to the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        self._ensure_parent_dir()
+        with self._rw_lock.write_locked(self.lock_timeout):
+            with file_lock(self.path, False, self.lock_timeout):
+                if isinstance(expected, str):
+                    current = self.file_digest()
+                else:
+                    current = self.file_state()
+
+                if current != expected:
+                    return False
+
+                return self._write_unlocked(data)
+
+
+    def update(self, patch : Any) -> bool:
+        """
+        Records a change to a JSON file in its append-only journal, so the
+        cost of the change depends on its size rather than the file's.
+
+        See `JSONFile.update()` for the patch format and compaction.
+
+        
+        Parameters
+        ----------
+        patch : Any
+            The JSON merge patch to apply.
+
+        
+        Returns
+        -------
+        bool
+            True,  if the change was recorded.
+            False, otherwise.
+
+
+        Raises
+        ------
+        TypeError
+            If the file is not a JSON file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        if not isinstance(self.extension, JSONFile):
+            raise TypeError(f'Journaled updates require a JSON file, not {self.path.name}')
+
+        self._ensure_parent_dir()
+        with self._locked(shared=False):
+            return self.extension.update(patch)
+
+
+    def _ensure_parent_dir(self) -> None:
+        """
+        Creates the file's directory if it does not exist yet, for handlers
+        constructed without creating their file.
+        """
+
+        if not self.path.parent.is_dir():
+            FileHandler.create_dir(self.path.parent)
+
+
+    def _write_unlocked(self, data : Any) -> bool:
+        """
+        Writes data to file, assuming the caller holds the write locks.
+
+        
         Parameters
         ----------
         data : Any
@@ -322,14 +771,540 @@ class FileHandler:
             If process does not have the permission to write to the file.
         """
 
+        if self.atomic_writes:
+            self._check_atomic_writable()
+            return self._write_atomic(
+                lambda path: type(self.extension)(path).write(data)
+            )
+
         try:
-            open(self.path, mode='w')
+            open(self.path, mode='w').close()
 
         except PermissionError:
             raise PermissionError(f'Lacking permissions to write to file {self.path}')
         
         else:
             return self.extension.write(data)
+
+
+    def _check_atomic_writable(self) -> None:
+        """
+        Checks that the file can be replaced, without truncating it.
+
+
+        Raises
+        ------
+        PermissionError
+            If process does not have the permission to write to the file.
+        """
+
+        writable = os.access(self.path.parent, os.W_OK) and (
+            not self.file_exists() or os.access(self.path, os.W_OK)
+        )
+        if not writable:
+            raise PermissionError(f'Lacking permissions to write to file {self.path}')
+
+
+    def _write_atomic(self, write : Callable[[Path], bool]) -> bool:
+        """
+        Writes to a temporary file next to the file, then renames it
+        over the file.
+
+        
+        Parameters
+        ----------
+        write : Callable[[pathlib.Path], bool]
+            Writes the data to the given path, returning whether it
+            succeeded.
+
+        
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file successfully.
+            False, otherwise.
+        """
+
+        fd, temp_path = _create_temp_file(self.path)
+        os.close(fd)
+
+        saved = False
+        try:
+            saved = write(temp_path)
+            if saved:
+                _commit_temp_file(temp_path, self.path)
+                self._discard_journal()
+
+        finally:
+            if not saved:
+                temp_path.unlink(missing_ok=True)
+
+        return saved
+    
+    
+    def open_writer(self, **options : Any) -> WriterSession:
+        """
+        Opens a session that writes the file incrementally, so that data
+        never has to be held in memory all at once.
+
+        The session accepts lines for txt files, rows for CSV files,
+        array elements or object members for JSON files, and documents for
+        YAML files. Output is buffered and replaces the file atomically
+        when the session is closed, or is discarded if it is aborted.
+        The write locks are held until then, so the thread holding a
+        session must not read through this handler until it is closed.
+
+        
+        Parameters
+        ----------
+        **options : Any
+            Options for the extension's writer, such as `mode='object'`
+            for JSON files.
+
+
+        Returns
+        -------
+        WriterSession
+            The session, usable as a context manager that commits on
+            success and aborts on error.
+
+
+        Raises
+        ------
+        NotImplementedError
+            If the file format does not support incremental writes.
+
+        PermissionError
+            If process does not have the permission to write to the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        self._ensure_parent_dir()
+        self._check_atomic_writable()
+
+        locks = ExitStack()
+        locks.enter_context(self._locked(shared=False))
+        try:
+            return self.extension.open_writer(on_close = locks.close, **options)
+
+        except BaseException:
+            locks.close()
+            raise
+
+
+    def read_bytes(self) -> bytes:
+        """
+        Returns the raw contents of the file, without parsing them.
+
+        
+        Returns
+        -------
+        bytes
+            The contents of the file.
+
+
+        Raises
+        ------
+        PermissionError
+            If process does not have the permission to read from the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        with self._locked(shared=True):
+            try:
+                with open(self.path, 'rb', buffering=0) as f:
+                    return f.readall()
+
+            except PermissionError:
+                raise PermissionError(f'Lacking permissions to read from file {self.path}')
+
+
+    def readinto(self, buffer : bytearray | memoryview) -> int:
+        """
+        Reads the raw contents of the file directly into a preallocated
+        buffer, such as a `bytearray`, `mmap.mmap` or `memoryview`.
+
+        Reads stop when the buffer is full or the file ends, so a buffer
+        smaller than the file receives only the start of the file.
+
+        
+        Parameters
+        ----------
+        buffer : bytearray | memoryview
+            Writable buffer to fill with the contents of the file.
+
+
+        Returns
+        -------
+        int
+            The number of bytes read into the buffer.
+
+
+        Raises
+        ------
+        PermissionError
+            If process does not have the permission to read from the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        with self._locked(shared=True):
+            try:
+                with (
+                    open(self.path, 'rb', buffering=0) as f,
+                    memoryview(buffer).cast('B') as view
+                ):
+                    total = 0
+                    while total < len(view):
+                        count = f.readinto(view[total:])
+                        if not count:
+                            break
+                        total += count
+                    return total
+
+            except PermissionError:
+                raise PermissionError(f'Lacking permissions to read from file {self.path}')
+
+
+    def iter_chunks(
+        self, 
+        size : int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[memoryview]:
+        """
+        Yields the raw contents of the file in chunks.
+
+        Every chunk is a view of the same reusable buffer, so a chunk is
+        only valid until the next one is requested. Copy it with `bytes()`
+        to keep it longer. The file stays locked until iteration ends.
+
+        
+        Parameters
+        ----------
+        size : int, default = 1 MiB
+            The maximum number of bytes in each chunk.
+
+
+        Yields
+        ------
+        memoryview
+            The next chunk of the file.
+
+
+        Raises
+        ------
+        ValueError
+            If `size` is not positive.
+
+        PermissionError
+            If process does not have the permission to read from the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        if size <= 0:
+            raise ValueError('Chunk size must be positive')
+
+        with self._locked(shared=True):
+            try:
+                f = open(self.path, 'rb', buffering=0)
+
+            except PermissionError:
+                raise PermissionError(f'Lacking permissions to read from file {self.path}')
+
+            with f, memoryview(bytearray(size)) as view:
+                while count := f.readinto(view):
+                    yield view[:count]
+
+
+    def write_bytes(self, data : bytes | bytearray | memoryview) -> bool:
+        """
+        Writes raw bytes to the file, replacing its contents, without
+        encoding them through the file's extension.
+
+        
+        Parameters
+        ----------
+        data : bytes | bytearray | memoryview
+            The bytes to write to the file.
+
+        
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file successfully.
+            False, otherwise.
+
+
+        Raises
+        ------
+        PermissionError
+            If process does not have the permission to write to the file.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        self._ensure_parent_dir()
+        with self._locked(shared=False):
+            if self.atomic_writes:
+                self._check_atomic_writable()
+                return self._write_atomic(
+                    lambda path: FileHandler._write_bytes_to(path, data)
+                )
+
+            try:
+                saved = FileHandler._write_bytes_to(self.path, data)
+                self._discard_journal()
+                return saved
+
+            except PermissionError:
+                raise PermissionError(f'Lacking permissions to write to file {self.path}')
+
+
+    @staticmethod
+    def _write_bytes_to(path : Path, data : bytes | bytearray | memoryview) -> bool:
+        """
+        Writes raw bytes to a path, replacing its contents.
+
+        
+        Returns
+        -------
+        bool
+            True, once the data has been written.
+        """
+
+        with open(path, 'wb') as f:
+            f.write(data)
+        return True
+    
+    
+    def copy_to(self, destination : Path) -> 'FileHandler':
+        """
+        Copies the file, without reading it through Python where the
+        platform allows.
+
+        Reflinks are used on copy-on-write filesystems, otherwise the copy
+        happens inside the kernel, falling back to an ordinary copy. The
+        destination is replaced atomically. Any journaled updates to a
+        JSON file are folded into it first, so the copy holds them.
+
+        
+        Parameters
+        ----------
+        destination : pathlib.Path
+            The relative or absolute path to copy the file to.
+
+
+        Returns
+        -------
+        FileHandler
+            A handler for the copy.
+
+
+        Raises
+        ------
+        ValueError
+            If the destination does not have a FileExtension to handle it.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        target = FileHandler(destination, create = False)
+        target._ensure_parent_dir()
+        self._compact_journal()
+
+        with self._locked(shared=True):
+            copy_file(self.path, target.path)
+
+        return target
+
+
+    def move_to(self, destination : Path) -> None:
+        """
+        Moves the file, after which this handler manages it at its new
+        path. The destination is replaced atomically.
+
+        The file is renamed if possible, or copied and then removed if the
+        destination is on another filesystem. Any journaled updates to a
+        JSON file are folded into it first, and its lock file is removed.
+
+        
+        Parameters
+        ----------
+        destination : pathlib.Path
+            The relative or absolute path to move the file to.
+
+
+        Raises
+        ------
+        ValueError
+            If the destination does not have a FileExtension to handle it.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        target = FileHandler(destination, create = False)
+        target._ensure_parent_dir()
+        self._compact_journal()
+        registry_key = self.path.resolve()
+
+        with self._locked(shared=False):
+            try:
+                os.replace(self.path, target.path)
+
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                copy_file(self.path, target.path)
+                self.path.unlink()
+
+            lock_path_for(self.path).unlink(missing_ok = True)
+
+            with FileHandler._registry_lock:
+                if FileHandler._registry.get(registry_key) is self:
+                    del FileHandler._registry[registry_key]
+                    FileHandler._registry.setdefault(target.path.resolve(), self)
+
+            self.path = target.path
+            self.extension = target.extension
+
+
+    def snapshot(
+        self,
+        directory : Path | None = None,
+        keep : int | None = DEFAULT_SNAPSHOTS_KEPT,
+        max_age : timedelta | None = None
+    ) -> 'FileHandler':
+        """
+        Copies the file into a timestamped snapshot, then deletes old
+        snapshots according to the retention policy.
+
+        Snapshots are named `<stem>.<UTC timestamp><suffix>`, so they can
+        be read by a FileHandler, and are copied as by `copy_to()`, which
+        is near-instant on filesystems supporting reflinks.
+
+        
+        Parameters
+        ----------
+        directory : pathlib.Path | None, default = None
+            Directory to keep snapshots in, None for a `.snapshots`
+            directory next to the file.
+
+        keep : int | None, default = 10
+            Number of most recent snapshots to keep, including the one
+            just taken, None for no limit.
+
+        max_age : datetime.timedelta | None, default = None
+            Age past which snapshots are deleted, None for no limit.
+            The snapshot just taken is always kept.
+
+
+        Returns
+        -------
+        FileHandler
+            A handler for the new snapshot.
+
+
+        Raises
+        ------
+        ValueError
+            If `keep` is less than 1.
+
+        TimeoutError
+            If a lock could not be acquired within `lock_timeout` seconds.
+        """
+
+        if keep is not None and keep < 1:
+            raise ValueError('keep must be at least 1, or None for no limit')
+
+        directory = self._snapshot_directory(directory)
+        taken_at = datetime.now(timezone.utc)
+        name = f'{self.path.stem}.{taken_at.strftime(SNAPSHOT_TIME_FORMAT)}{self.path.suffix}'
+        snapshot = self.copy_to(directory / name)
+
+        older = [path for path in self.snapshots(directory) if path != snapshot.path]
+        expired = set()
+        if keep is not None:
+            expired.update(older[:max(0, len(older) + 1 - keep)])
+        if max_age is not None:
+            expired.update(
+                path for path in older if taken_at - _snapshot_time(path) > max_age
+            )
+        for path in expired:
+            path.unlink(missing_ok = True)
+
+        return snapshot
+
+
+    def snapshots(self, directory : Path | None = None) -> list[Path]:
+        """
+        Returns the snapshots taken of the file, oldest first.
+
+        
+        Parameters
+        ----------
+        directory : pathlib.Path | None, default = None
+            Directory snapshots are kept in, None for a `.snapshots`
+            directory next to the file.
+
+
+        Returns
+        -------
+        list[pathlib.Path]
+            The absolute paths of the snapshots.
+        """
+
+        directory = self._snapshot_directory(directory)
+        found = []
+        for path in directory.glob(f'{self.path.stem}.*{self.path.suffix}'):
+            stem, _, _ = path.name.removesuffix(path.suffix).rpartition('.')
+            if stem != self.path.stem:
+                continue
+            try:
+                found.append((_snapshot_time(path), path))
+            except ValueError:
+                continue
+        return [path for _, path in sorted(found)]
+
+
+    def _snapshot_directory(self, directory : Path | None) -> Path:
+        """
+        Returns the absolute directory snapshots are kept in.
+        """
+
+        if directory is None:
+            return self.path.parent / SNAPSHOT_DIRECTORY
+        return self._resolve_path(directory)
+
+
+    def _discard_journal(self) -> None:
+        """
+        Deletes a JSON file's journal once the file has been replaced
+        through a temporary file or as raw bytes, which bypass
+        `JSONFile.write()`.
+        """
+
+        if isinstance(self.extension, JSONFile):
+            _discard_journal(self.path)
+
+
+    def _compact_journal(self) -> None:
+        """
+        Folds journaled updates into a JSON file before it is copied or
+        moved, since the journal is not copied or moved with it.
+        """
+
+        if isinstance(self.extension, JSONFile) and self.extension.journal_path.exists():
+            with self._locked(shared=False):
+                self.extension.compact()
     
     
     def print(self) -> None:
@@ -347,4 +1322,20 @@ class FileHandler:
             self.extension.print()
             
         except PermissionError:
-            raise PermissionError(f'Lacking permissions to read from file {self.path}')
\ No newline at end of file
+            raise PermissionError(f'Lacking permissions to read from file {self.path}')
+
+
+
+def _snapshot_time(path : Path) -> datetime:
+    """
+    Returns the time a snapshot was taken, from its name.
+
+
+    Raises
+    ------
+    ValueError
+        If the name does not hold a snapshot timestamp.
+    """
+
+    timestamp = path.name.removesuffix(path.suffix).rsplit('.', 1)[-1]
+    return datetime.strptime(timestamp, SNAPSHOT_TIME_FORMAT).replace(tzinfo=timezone.utc)
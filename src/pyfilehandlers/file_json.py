@@ -4,14 +4,81 @@ Contains a class that handles JSON file IO.
 """
 
 import json
+import os
 from pathlib import Path
 
 from lunapyutils import handle_error
 
 from .file_extension import FileExtension
+from .file_writer import WriterSession, _commit_temp_file, _create_temp_file
+from .schema import decode, encode
 
 
-from typing import override
+from typing import Any, Callable, Literal, override
+
+
+JOURNAL_SUFFIX = '.journal'
+JOURNAL_MAX_BYTES = 1 << 20
+JOURNAL_MAX_RATIO = 0.5
+JOURNAL_MIN_BYTES = 1 << 12
+
+
+
+def _encode_default(value : Any) -> Any:
+    """
+    Encodes objects `json` can not serialize itself, such as dataclasses.
+
+    
+    Raises
+    ------
+    TypeError
+        If the object can not be encoded.
+    """
+
+    encoded = encode(value)
+    if encoded is value:
+        raise TypeError(
+            f'Object of type {type(value).__name__} is not JSON serializable'
+        )
+    return encoded
+
+
+def merge_patch(target : Any, patch : Any) -> Any:
+    """
+    Applies a JSON merge patch (RFC 7396) to data, modifying it in place
+    where possible.
+
+    Members of the patch replace members of the target, recursively for
+    objects, and members set to None are removed. Applying a sequence of
+    patches twice gives the same result as applying it once.
+
+    
+    Parameters
+    ----------
+    target : Any
+        The data to patch.
+
+    patch : Any
+        The patch to apply.
+
+    
+    Returns
+    -------
+    Any
+        The patched data.
+    """
+
+    if not isinstance(patch, dict):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = merge_patch(target.get(key), value)
+    return target
 
 
 
@@ -24,6 +91,20 @@ class JSONFile(FileExtension):
     ----------
     path : pathlib.Path
         Absolute path of the file to be managed.
+
+    journal_path : pathlib.Path
+        Absolute path of the sidecar file that `update()` appends to.
+
+    journal_max_bytes : int
+        Size the journal may reach before it is compacted.
+
+    journal_max_ratio : float
+        Size the journal may reach relative to the file before it is
+        compacted.
+
+    journal_min_bytes : int
+        Size below which the journal is never compacted, so that small
+        files are not rewritten on every update.
     """
 
 
@@ -38,24 +119,46 @@ class JSONFile(FileExtension):
             Absolute path of the file to be managed.
         """
         super().__init__(path = path, extension_suffix = '.json')
+        self.journal_path = _journal_path(path)
+        self.journal_max_bytes = JOURNAL_MAX_BYTES
+        self.journal_max_ratio = JOURNAL_MAX_RATIO
+        self.journal_min_bytes = JOURNAL_MIN_BYTES
 
 
-    def read(self) -> dict | None:
+    def read(self, schema : Any = None) -> Any | None:
         """
-        Opens JSON file and returns its data.
+        Opens JSON file and returns its data, with any updates held in
+        its journal applied.
 
         
+        Parameters
+        ----------
+        schema : Any, default = None
+            A dataclass, NamedTuple or generic such as `list[Record]` to
+            decode the data into, validating it as it is decoded.
+            None, to return the data as parsed.
+
+
         Returns
         -------
-        dict
-            The data contained in the file.
+        Any
+            The data contained in the file, usually a dict if no schema
+            is given.
             None, if there was an error.
+
+
+        Raises
+        ------
+        schema.SchemaError
+            If the data does not match the schema.
         """
 
         data = None
         try:
             with open(self.path, 'r') as f:
                 data = json.load(f)
+                base = os.fstat(f.fileno())
+            data = self._apply_journal(data, base)
 
         except IOError as e:
             handle_error(e, 'JSONFile.open()',
@@ -66,18 +169,21 @@ class JSONFile(FileExtension):
                          'erroneous error opening file')
 
         finally:
-            return data
+            if data is None or schema is None:
+                return data
+            return decode(data, schema)
         
 
-    def write(self, data : dict) -> bool:
+    def write(self, data : Any) -> bool:
         """
-        Writes data to JSON file.
+        Writes data to JSON file, discarding any journaled updates.
 
         
         Parameters
         ----------
-        data : dict
-            The data to write to the file.
+        data : Any
+            The data to write to the file. Dataclasses and NamedTuples
+            are encoded as objects and arrays.
 
             
         Returns
@@ -90,8 +196,9 @@ class JSONFile(FileExtension):
         saved = False
         try: 
             with open(self.path, 'w') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                saved = True
+                json.dump(data, f, ensure_ascii=False, indent=2, default=_encode_default)
+            _discard_journal(self.path)
+            saved = True
         
         except Exception as e:
             handle_error(e, 'JSONFile.write()', 'error writing to file')
@@ -100,6 +207,209 @@ class JSONFile(FileExtension):
             return saved
         
 
+    def update(self, patch : Any) -> bool:
+        """
+        Records a change to the JSON file by appending it to the journal,
+        rather than rewriting the whole file.
+
+        The change is a JSON merge patch (RFC 7396), so `{'a': 1}` sets
+        `a`, and `{'a': None}` removes it. The journal is folded back into
+        the file by `compact()` once its changes grow past
+        `journal_max_bytes`, or past both `journal_min_bytes` and
+        `journal_max_ratio` times the size of the file. If the file is
+        empty, the change is written to the file directly.
+
+        
+        Parameters
+        ----------
+        patch : Any
+            The merge patch to apply.
+
+            
+        Returns
+        -------
+        bool
+            True,  if the change was recorded.
+            False, otherwise.
+        """
+
+        saved = False
+        try:
+            if not self.path.exists() or self.path.stat().st_size == 0:
+                saved = self.write(merge_patch(None, patch))
+                return
+
+            record = json.dumps(
+                patch, ensure_ascii=False, separators=(',', ':'), 
+                default=_encode_default
+            )
+            header = self._journal_header()
+            with open(self.journal_path, 'a+') as f:
+                f.seek(0)
+                if f.readline().rstrip('\n') != header:
+                    f.truncate(0)
+                    f.write(header + '\n')
+                f.write(record + '\n')
+            saved = True
+
+            # the header is not a change, so it does not count
+            journal_size = self.journal_path.stat().st_size - len(header) - 1
+            file_size = self.path.stat().st_size
+            if (journal_size > self.journal_max_bytes
+                    or journal_size > max(self.journal_min_bytes,
+                                          self.journal_max_ratio * file_size)):
+                saved = self.compact()
+        
+        except Exception as e:
+            handle_error(e, 'JSONFile.update()', 'error writing to file')
+
+        finally:
+            return saved
+
+
+    def compact(self) -> bool:
+        """
+        Folds the journal into the JSON file, atomically replacing the
+        file with its current data, then deletes the journal.
+
+            
+        Returns
+        -------
+        bool
+            True,  if the journal was folded into the file, or was empty.
+            False, otherwise.
+        """
+
+        if not self.journal_path.exists():
+            return True
+
+        data = self.read()
+        if data is None:
+            return False
+
+        fd, temp_path = _create_temp_file(self.path)
+        os.close(fd)
+
+        saved = False
+        try:
+            saved = JSONFile(temp_path).write(data)
+            if saved:
+                # once replaced, the journal no longer matches the file and
+                # is ignored, so a crash before deleting it loses nothing
+                _commit_temp_file(temp_path, self.path)
+                self.journal_path.unlink(missing_ok = True)
+
+        finally:
+            if not saved:
+                temp_path.unlink(missing_ok = True)
+
+        return saved
+
+
+    def _journal_header(self, stat : os.stat_result | None = None) -> str:
+        """
+        Returns the first line of a journal that applies to a version of
+        the file, identifying it by its stat data.
+
+
+        Parameters
+        ----------
+        stat : os.stat_result | None, default = None
+            Stat data of the version, None for the file as it is now.
+        """
+
+        if stat is None:
+            stat = self.path.stat()
+        return json.dumps(
+            {'base' : [stat.st_ino, stat.st_size, stat.st_mtime_ns]},
+            separators=(',', ':')
+        )
+
+
+    def _apply_journal(self, data : Any, base : os.stat_result) -> Any:
+        """
+        Applies the changes held in the journal to the file's data.
+
+        A journal written against an earlier version of the file, such as
+        one left behind by an interrupted `compact()` or outdated by a
+        `write()`, is ignored, as is a partially written final record.
+
+        
+        Parameters
+        ----------
+        data : Any
+            The data held in the file.
+
+        base : os.stat_result
+            Stat data of the file the data was parsed from, taken from its
+            open handle, so that a journal started after the file was
+            replaced is not applied to the replaced version.
+
+
+        Returns
+        -------
+        Any
+            The data with the journal's changes applied.
+        """
+
+        try:
+            f = open(self.journal_path, 'r')
+        except FileNotFoundError:
+            return data
+
+        with f:
+            if f.readline().rstrip('\n') != self._journal_header(base):
+                return data
+
+            for line in f:
+                try:
+                    patch = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                data = merge_patch(data, patch)
+
+        return data
+
+
+    @override
+    def open_writer(
+        self, 
+        mode : Literal['array', 'object'] = 'array',
+        on_close : Callable[[], None] | None = None
+    ) -> 'JSONArrayWriter | JSONObjectWriter':
+        """
+        Opens a session that writes the JSON file incrementally, as either
+        a top-level array built element by element, or a top-level object
+        built member by member.
+
+        
+        Parameters
+        ----------
+        mode : Literal['array', 'object'], default = 'array'
+            Whether the file holds an array or an object.
+
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+
+
+        Returns
+        -------
+        JSONArrayWriter | JSONObjectWriter
+            The session, which replaces the file when closed.
+
+
+        Raises
+        ------
+        ValueError
+            If `mode` is not 'array' or 'object'.
+        """
+
+        match mode:
+            case 'array'  : return JSONArrayWriter(self.path, on_close = on_close)
+            case 'object' : return JSONObjectWriter(self.path, on_close = on_close)
+            case _: raise ValueError(f'Unknown JSON writer mode {mode!r}')
+
+
     @override
     def print(self) -> None:
         """
@@ -108,3 +418,105 @@ class JSONFile(FileExtension):
         
         data = self.read()
         print(json.dumps(data, indent=2))
+
+
+
+class _JSONWriter(WriterSession):
+    """
+    Base of the JSON writers, which discard the file's journaled updates
+    once the file is replaced.
+    """
+
+
+    def _committed(self) -> None:
+        _discard_journal(self.path)
+
+
+
+class JSONArrayWriter(_JSONWriter):
+    """
+    Writes a JSON file holding an array, one element at a time.
+
+    Each element is written compactly on its own line.
+    """
+
+
+    def _begin(self) -> None:
+        self._count = 0
+        self._file.write('[')
+
+
+    def append(self, element : Any) -> None:
+        """
+        Writes an element of the array.
+        """
+
+        self._check_open()
+        self._file.write(',\n  ' if self._count else '\n  ')
+        self._file.write(
+            json.dumps(element, ensure_ascii=False, default=_encode_default)
+        )
+        self._count += 1
+
+
+    def _end(self) -> None:
+        self._file.write('\n]\n' if self._count else ']\n')
+
+
+
+class JSONObjectWriter(_JSONWriter):
+    """
+    Writes a JSON file holding an object, one member at a time.
+
+    Each member is written compactly on its own line. Keys are not checked
+    for duplicates.
+    """
+
+
+    def _begin(self) -> None:
+        self._count = 0
+        self._file.write('{')
+
+
+    def put(self, key : str, value : Any) -> None:
+        """
+        Writes a member of the object.
+
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string.
+        """
+
+        self._check_open()
+        if not isinstance(key, str):
+            raise TypeError(f'JSON object keys must be str, not {type(key).__name__}')
+
+        self._file.write(',\n  ' if self._count else '\n  ')
+        self._file.write(json.dumps(key, ensure_ascii=False))
+        self._file.write(': ')
+        self._file.write(
+            json.dumps(value, ensure_ascii=False, default=_encode_default)
+        )
+        self._count += 1
+
+
+    def _end(self) -> None:
+        self._file.write('\n}\n' if self._count else '}\n')
+
+
+
+def _journal_path(path : Path) -> Path:
+    """
+    Returns the path of the journal of a JSON file.
+    """
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+
+def _discard_journal(path : Path) -> None:
+    """
+    Deletes the journal of a JSON file whose contents have been replaced,
+    so that its updates are never replayed onto the new contents.
+    """
+    _journal_path(path).unlink(missing_ok = True)
@@ -0,0 +1,177 @@
+"""file_jsonl.py
+
+Contains a class that handles JSON Lines file IO.
+"""
+
+import json
+from pathlib import Path
+
+from lunapyutils import handle_error
+
+from .file_extension import FileExtension
+from .file_json import _encode_default
+from .file_writer import WriterSession
+
+
+from typing import Any, Callable, Iterable, Iterator
+
+
+
+class JSONLinesFile(FileExtension):
+    """
+    Class that handles JSON Lines file IO, where each line of the file
+    holds one JSON value.
+
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Absolute path of the file to be managed.
+    """
+
+
+    def __init__(self, path : Path) -> None:
+        """
+        Initializes JSONLinesFile instance.
+
+
+        Attributes
+        ----------
+        path : pathlib.Path
+            Absolute path of the file to be managed.
+        """
+        super().__init__(path = path, extension_suffix = '.jsonl')
+
+
+    def read(self) -> list[Any] | None:
+        """
+        Opens JSON Lines file and returns its records.
+
+
+        Returns
+        -------
+        list[Any]
+            The records contained in the file.
+            None, if there was an error.
+        """
+
+        data = None
+        try:
+            data = list(self.iter_records())
+
+        except IOError as e:
+            handle_error(e, 'JSONLinesFile.open()',
+                         'error opening file')
+
+        except Exception as e:
+            handle_error(e, 'JSONLinesFile.open()',
+                         'erroneous error opening file')
+
+        finally:
+            return data
+
+
+    def iter_records(self) -> Iterator[Any]:
+        """
+        Opens JSON Lines file and yields its records one at a time.
+        Blank lines are skipped.
+
+
+        Yields
+        ------
+        Any
+            The next record in the file.
+
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If a line does not hold valid JSON.
+        """
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+    def write(self, data : Iterable[Any]) -> bool:
+        """
+        Writes records to JSON Lines file. Overwrites all data held in file.
+
+
+        Parameters
+        ----------
+        data : Iterable[Any]
+            The records to write to the file, one per line.
+
+
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file.
+            False, otherwise.
+        """
+
+        saved = False
+        try:
+            with open(self.path, 'w') as f:
+                for record in data:
+                    f.write(_dump_record(record))
+                    f.write('\n')
+                saved = True
+
+        except Exception as e:
+            handle_error(e, 'JSONLinesFile.write()', 'error writing to file')
+
+        finally:
+            return saved
+
+
+    def open_writer(
+        self,
+        on_close : Callable[[], None] | None = None
+    ) -> 'JSONLinesWriter':
+        """
+        Opens a session that writes the JSON Lines file record by record.
+
+
+        Parameters
+        ----------
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+
+
+        Returns
+        -------
+        JSONLinesWriter
+            The session, which replaces the file when closed.
+        """
+        return JSONLinesWriter(self.path, on_close = on_close)
+
+
+
+class JSONLinesWriter(WriterSession):
+    """
+    Writes a JSON Lines file record by record.
+    """
+
+
+    def append(self, record : Any) -> None:
+        """
+        Writes a record on its own line.
+        """
+
+        self._check_open()
+        self._file.write(_dump_record(record))
+        self._file.write('\n')
+
+
+
+def _dump_record(record : Any) -> str:
+    """
+    Encodes a record as compact single-line JSON.
+    """
+    return json.dumps(
+        record, ensure_ascii=False, separators=(',', ':'), default=_encode_default
+    )
@@ -0,0 +1,255 @@
+"""file_lock.py
+
+Contains classes that coordinate access to a single file, both between
+threads of one process and between processes.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl is POSIX only, inter-process locking is unavailable elsewhere
+    fcntl = None
+
+
+from typing import Iterator
+
+
+LOCK_SUFFIX = '.lock'
+LOCK_POLL_INTERVAL = 0.005
+
+
+
+class ReadWriteLock:
+    """
+    An in-process reader-writer lock.
+
+    Any number of threads may hold the lock for reading at once, while a
+    writer holds it exclusively. Waiting writers are preferred over new
+    readers so that a steady stream of reads can not starve a write.
+    """
+
+
+    def __init__(self) -> None:
+        """
+        Initializes ReadWriteLock instance.
+        """
+
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+
+    def acquire_read(self, timeout : float | None = None) -> bool:
+        """
+        Acquires the lock for reading.
+
+
+        Parameters
+        ----------
+        timeout : float | None, default = None
+            Seconds to wait for the lock, waits forever if None.
+
+
+        Returns
+        -------
+        bool
+            True,  if the lock was acquired.
+            False, if the timeout expired.
+        """
+
+        with self._condition:
+            acquired = self._condition.wait_for(
+                lambda: not self._writer and not self._waiting_writers,
+                timeout
+            )
+            if acquired:
+                self._readers += 1
+            return acquired
+
+
+    def release_read(self) -> None:
+        """
+        Releases the lock after reading.
+        """
+
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+
+    def acquire_write(self, timeout : float | None = None) -> bool:
+        """
+        Acquires the lock for writing.
+
+
+        Parameters
+        ----------
+        timeout : float | None, default = None
+            Seconds to wait for the lock, waits forever if None.
+
+
+        Returns
+        -------
+        bool
+            True,  if the lock was acquired.
+            False, if the timeout expired.
+        """
+
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                acquired = self._condition.wait_for(
+                    lambda: not self._writer and not self._readers,
+                    timeout
+                )
+            finally:
+                self._waiting_writers -= 1
+
+            if acquired:
+                self._writer = True
+            else:
+                self._condition.notify_all()
+            return acquired
+
+
+    def release_write(self) -> None:
+        """
+        Releases the lock after writing.
+        """
+
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+    @contextmanager
+    def read_locked(self, timeout : float | None = None) -> Iterator[None]:
+        """
+        Holds the lock for reading for the duration of a `with` block.
+
+
+        Raises
+        ------
+        TimeoutError
+            If the lock could not be acquired within `timeout` seconds.
+        """
+
+        if not self.acquire_read(timeout):
+            raise TimeoutError('Timed out waiting for read lock')
+        try:
+            yield
+        finally:
+            self.release_read()
+
+
+    @contextmanager
+    def write_locked(self, timeout : float | None = None) -> Iterator[None]:
+        """
+        Holds the lock for writing for the duration of a `with` block.
+
+
+        Raises
+        ------
+        TimeoutError
+            If the lock could not be acquired within `timeout` seconds.
+        """
+
+        if not self.acquire_write(timeout):
+            raise TimeoutError('Timed out waiting for write lock')
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+
+def lock_path_for(path : Path) -> Path:
+    """
+    Returns the path of the sidecar lock file for a file.
+
+    A sidecar is used rather than the file itself since atomic writes
+    replace the file, which would silently drop any lock held on it.
+
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the file to be locked.
+
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the lock file.
+    """
+    return path.with_name(path.name + LOCK_SUFFIX)
+
+
+@contextmanager
+def file_lock(
+    path : Path,
+    shared : bool = False,
+    timeout : float | None = None
+) -> Iterator[None]:
+    """
+    Holds an advisory `fcntl.flock` lock on a file's sidecar lock file
+    for the duration of a `with` block.
+
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the file to be locked.
+
+    shared : bool, default = False
+        True,  to take a shared lock, for reading.
+        False, to take an exclusive lock, for writing.
+
+    timeout : float | None, default = None
+        Seconds to wait for the lock, waits forever if None.
+
+
+    Raises
+    ------
+    NotImplementedError
+        If the platform does not support `fcntl`.
+
+    TimeoutError
+        If the lock could not be acquired within `timeout` seconds.
+    """
+
+    if fcntl is None:
+        raise NotImplementedError('File locking requires fcntl (POSIX only)')
+
+    operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    fd = os.open(lock_path_for(path), os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if timeout is None:
+            fcntl.flock(fd, operation)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(
+                            f'Timed out waiting for lock on file {path}'
+                        )
+                    time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    finally:
+        os.close(fd)
@@ -3,11 +3,17 @@
 Contains a class that handles txt file IO.
 """
 
+import locale
 from pathlib import Path
 
 from lunapyutils import handle_error
 
 from .file_extension import FileExtension
+from .file_writer import WriterSession
+from .line_store import LineStore
+
+
+from typing import Callable, Iterable
 
 
 
@@ -36,22 +42,36 @@ class TxtFile(FileExtension):
         super().__init__(path = path, extension_suffix = '.txt')
 
 
-    def read(self) -> list[str] | None:
+    def read(self, compact : bool = False) -> list[str] | LineStore | None:
         """
         Opens txt file and returns its data.
 
+
+        Parameters
+        ----------
+        compact : bool, default = False
+            Return the lines as a `LineStore`, which keeps the file in a
+            single buffer and decodes each line, without its newline, only
+            when it is accessed.
+
         
         Returns
         -------
         list[str]
             The data contained in the file.
+            LineStore, if `compact` is True.
             None, if there was an error.
         """
 
         data = None
         try:
-            with open(self.path, 'r') as f:
-                data = f.readlines()
+            if compact:
+                data = LineStore.from_file(
+                    self.path, locale.getpreferredencoding(False)
+                )
+            else:
+                with open(self.path, 'r') as f:
+                    data = f.readlines()
 
         except IOError as e:
             handle_error(e, 'TxtFile.open()',
@@ -87,7 +107,9 @@ class TxtFile(FileExtension):
         try: 
             with open(self.path, 'w') as f:
                 if isinstance(data, list):
-                    f.writelines(line + '\n' for line in data)
+                    for line in data:
+                        f.write(line)
+                        f.write('\n')
                 else:
                     f.write(data)
                 saved = True
@@ -99,6 +121,28 @@ class TxtFile(FileExtension):
             return saved
         
     
+    def open_writer(
+        self, 
+        on_close : Callable[[], None] | None = None
+    ) -> 'TxtWriter':
+        """
+        Opens a session that writes the txt file line by line.
+
+
+        Parameters
+        ----------
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+
+
+        Returns
+        -------
+        TxtWriter
+            The session, which replaces the file when closed.
+        """
+        return TxtWriter(self.path, on_close = on_close)
+
+
     def print(self) -> None:
         """
         Opens the text file and prints the data.
@@ -106,3 +150,29 @@ class TxtFile(FileExtension):
         
         data = self.read()
         print(data)
+
+
+
+class TxtWriter(WriterSession):
+    """
+    Writes a txt file line by line.
+    """
+
+
+    def write_line(self, line : str) -> None:
+        """
+        Writes a line, followed by a newline.
+        """
+
+        self._check_open()
+        self._file.write(line)
+        self._file.write('\n')
+
+
+    def write_lines(self, lines : Iterable[str]) -> None:
+        """
+        Writes each line, followed by a newline.
+        """
+
+        for line in lines:
+            self.write_line(line)
@@ -0,0 +1,279 @@
+"""file_writer.py
+
+Contains a class that writes a file incrementally, committing it
+atomically once writing is finished.
+"""
+
+import os
+import secrets
+import shutil
+from pathlib import Path
+
+
+from typing import Callable, Self
+
+
+WRITE_BUFFER_SIZE = 1 << 20
+TEMP_FILE_ATTEMPTS = 100
+
+
+
+class WriterSession:
+    """
+    Writes a file incrementally through a large reusable buffer.
+
+    Output goes to a temporary file next to the file, which replaces the
+    file when the session is closed, so readers only ever see the old or
+    the complete new contents. Used as a context manager, the session is
+    committed if the block finishes and aborted if it raises.
+
+    Subclasses add methods that accept data piece by piece, and may
+    override `_begin()` and `_end()` to write anything surrounding it, and
+    `_committed()` to act once the file has been replaced.
+
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Absolute path of the file being written.
+
+    closed : bool
+        Whether the session has been committed or aborted.
+    """
+
+
+    def __init__(
+        self,
+        path : Path,
+        buffer_size : int = WRITE_BUFFER_SIZE,
+        newline : str | None = None,
+        on_close : Callable[[], None] | None = None
+    ) -> None:
+        """
+        Initializes WriterSession instance.
+
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            Absolute path of the file to write.
+
+        buffer_size : int, default = 1 MiB
+            Size of the write buffer, output is written to disk whenever
+            it fills.
+
+        newline : str | None, default = None
+            Passed to `open()`, controls newline translation.
+
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted, such as to
+            release a lock held for the session.
+        """
+
+        self.path = path
+        self.closed = False
+        self._on_close = on_close
+
+        fd, self._temp_path = _create_temp_file(path)
+        try:
+            self._file = os.fdopen(
+                fd, 'w', buffering = buffer_size, newline = newline
+            )
+            self._begin()
+
+        except BaseException:
+            self._discard()
+            raise
+
+
+    def __enter__(self) -> Self:
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+    def _begin(self) -> None:
+        """
+        Writes anything that precedes the data, such as an opening bracket.
+        """
+        pass
+
+
+    def _end(self) -> None:
+        """
+        Writes anything that follows the data, such as a closing bracket.
+        """
+        pass
+
+
+    def _committed(self) -> None:
+        """
+        Runs once the file has been replaced, before `on_close` releases
+        any lock held for the session.
+        """
+        pass
+
+
+    def _check_open(self) -> None:
+        """
+        Raises
+        ------
+        ValueError
+            If the session has already been committed or aborted.
+        """
+
+        if self.closed:
+            raise ValueError(f'Writer session for {self.path} is closed')
+
+
+    def close(self) -> None:
+        """
+        Finishes writing and replaces the file with the written output.
+        Does nothing if the session is already closed.
+        """
+
+        if self.closed:
+            return
+
+        self.closed = True
+        try:
+            self._end()
+            self._file.close()
+            _commit_temp_file(self._temp_path, self.path)
+            self._committed()
+
+        except BaseException:
+            self._discard()
+            raise
+
+        finally:
+            self._release()
+
+
+    def abort(self) -> None:
+        """
+        Discards the written output, leaving the file untouched.
+        Does nothing if the session is already closed.
+        """
+
+        if self.closed:
+            return
+
+        self.closed = True
+        try:
+            self._discard()
+
+        finally:
+            self._release()
+
+
+    def _discard(self) -> None:
+        """
+        Closes and deletes the temporary file.
+        """
+
+        try:
+            self._file.close()
+
+        except (AttributeError, OSError):
+            pass
+
+        self._temp_path.unlink(missing_ok = True)
+
+
+    def _release(self) -> None:
+        """
+        Calls the `on_close` callback, once.
+        """
+
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+
+
+def _create_temp_file(path : Path) -> tuple[int, Path]:
+    """
+    Creates an empty temporary file next to a file, to be committed over
+    it with `_commit_temp_file()`.
+
+    Unlike `tempfile.mkstemp()`, which always uses mode 0600, the file is
+    created with the mode `open()` would give a new file under the current
+    umask.
+
+
+    Returns
+    -------
+    tuple[int, pathlib.Path]
+        The open descriptor and the path of the temporary file.
+
+
+    Raises
+    ------
+    FileExistsError
+        If no unused temporary name was found.
+    """
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for _ in range(TEMP_FILE_ATTEMPTS):
+        temp_path = path.with_name(f'.{path.name}.{secrets.token_hex(4)}{path.suffix}')
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+    raise FileExistsError(f'No unused temporary file name next to {path}')
+
+
+def _commit_temp_file(
+    temp_path : Path,
+    path : Path,
+    mode_source : Path | None = None
+) -> None:
+    """
+    Renames a fully written temporary file over a file.
+
+    The temporary file takes the mode of `mode_source`, or else of the
+    file it replaces, and keeps the mode it was created with for a new
+    file. It is flushed to disk before the rename, so that after a crash
+    the file holds either the old or the new contents.
+
+
+    Parameters
+    ----------
+    temp_path : pathlib.Path
+        Path of the temporary file, from `_create_temp_file()`.
+
+    path : pathlib.Path
+        Path of the file to replace.
+
+    mode_source : pathlib.Path | None, default = None
+        File to copy the mode of, None for `path`.
+
+
+    Raises
+    ------
+    OSError
+        If the temporary file could not be synced or renamed.
+    """
+
+    if mode_source is not None:
+        shutil.copymode(mode_source, temp_path)
+    else:
+        try:
+            shutil.copymode(path, temp_path)
+        except FileNotFoundError:
+            pass
+
+    fd = os.open(temp_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    os.replace(temp_path, path)
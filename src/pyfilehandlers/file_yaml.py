@@ -3,15 +3,25 @@
 Contains a class that handles YAML file IO.
 """
 
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from lunapyutils import handle_error
 from ruamel.yaml import YAML
 
 from .file_extension import FileExtension
+from .file_writer import WriterSession
+from .schema import decode, encode
 
 
-from typing import Any
+from typing import Any, Callable, Container, Iterator
+
+
+DOCUMENT_START = b'---'
+DOCUMENT_END = b'...'
+MARKER_ENDINGS = (b'', b' ', b'\t', b'\r', b'\n')
 
 
 
@@ -25,7 +35,9 @@ class YAMLFile(FileExtension):
     path : pathlib.Path
         Absolute path of the file to be managed.
     yaml : ruamel.yaml.YAML
-        YAML parser instance used for reading and writing YAML files.
+        A new YAML parser instance for reading or writing YAML files.
+        Parsers hold the state of one load or dump, so one is created per
+        call, letting threads and interleaved iterators share the handler.
     """
 
 
@@ -40,19 +52,39 @@ class YAMLFile(FileExtension):
             Absolute path of the file to be managed.
         """
         super().__init__(path = path, extension_suffix = '.yaml')
-        self.yaml = YAML(typ='safe')
+        self._document_index : tuple[tuple[int, int], array] | None = None
+
+
+    @property
+    def yaml(self) -> YAML:
+        return YAML(typ='safe')
 
 
-    def read(self) -> dict | None:
+    def read(self, schema : Any = None) -> Any | None:
         """
         Opens YAML file and returns its data.
 
         
+        Parameters
+        ----------
+        schema : Any, default = None
+            A dataclass, NamedTuple or generic such as `list[Record]` to
+            decode the data into, validating it as it is decoded.
+            None, to return the data as parsed.
+
+
         Returns
         -------
-        dict
-            The data contained in the file.
+        Any
+            The data contained in the file, usually a dict if no schema
+            is given.
             None, if there was an error.
+
+
+        Raises
+        ------
+        schema.SchemaError
+            If the data does not match the schema.
         """
 
         data = None
@@ -69,18 +101,21 @@ class YAMLFile(FileExtension):
                          'erroneous error opening file')
 
         finally:
-            return data
+            if data is None or schema is None:
+                return data
+            return decode(data, schema)
         
 
-    def write(self, data: dict[str, Any]) -> bool:
+    def write(self, data: Any) -> bool:
         """
         Writes data to YAML file.
 
         
         Parameters
         ----------
-        data : dict[str, Any]
-            The data to write to the file.
+        data : Any
+            The data to write to the file. Dataclasses and NamedTuples
+            are encoded as mappings and sequences.
 
             
         Returns
@@ -93,7 +128,7 @@ class YAMLFile(FileExtension):
         saved = False
         try: 
             with open(self.path, 'w') as f:
-                self.yaml.dump(data, f)
+                self.yaml.dump(encode(data), f)
                 saved = True
         
         except Exception as e:
@@ -101,3 +136,281 @@ class YAMLFile(FileExtension):
 
         finally:
             return saved
+
+
+    def document_offsets(self) -> array:
+        """
+        Returns the byte offset at which each document in the file starts.
+
+        The file is scanned for `---` markers at the start of a line
+        without being parsed. The index is cached until the file changes.
+        Any comments or directives before the first marker belong to the
+        first document, and `%` directives following a `...` end marker
+        belong to the document after them.
+
+
+        Returns
+        -------
+        array.array
+            The starting offset of each document, as `array('Q')`.
+        """
+
+        stat = self.path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._document_index is not None and self._document_index[0] == key:
+            return self._document_index[1]
+
+        offsets = array('Q')
+        content_seen = False
+        ended = False
+        directives_at = None
+        with open(self.path, 'rb') as f:
+            position = 0
+            for line in f:
+                if _is_document_start(line):
+                    if not content_seen:
+                        offsets.append(0)
+                    elif directives_at is not None:
+                        offsets.append(directives_at)
+                    else:
+                        offsets.append(position)
+                    content_seen = True
+                    ended = False
+                    directives_at = None
+                elif _is_document_end(line):
+                    ended = True
+                elif ended and line.startswith(b'%'):
+                    if directives_at is None:
+                        directives_at = position
+                elif not content_seen and _is_content(line):
+                    offsets.append(0)
+                    content_seen = True
+                position += len(line)
+
+        self._document_index = (key, offsets)
+        return offsets
+
+
+    def iter_documents(
+        self,
+        start : int = 0,
+        stop : int | None = None,
+        skip : Container[int] = ()
+    ) -> Iterator[Any]:
+        """
+        Opens YAML file and yields its documents one at a time, parsing
+        each only when it is requested.
+
+        Reading from the first document onwards streams through the file.
+        Otherwise the document offset index is used to seek straight to
+        the wanted documents, so skipped documents are never parsed.
+
+
+        Parameters
+        ----------
+        start : int, default = 0
+            Index of the first document to yield.
+
+        stop : int | None, default = None
+            Index after the last document to yield, None for all.
+
+        skip : Container[int], default = ()
+            Indices of documents not to yield.
+
+
+        Yields
+        ------
+        Any
+            The next document in the file.
+        """
+
+        if start == 0 and stop is None and not skip:
+            with open(self.path, 'rb') as f:
+                yield from self.yaml.load_all(f)
+            return
+
+        offsets = self.document_offsets()
+        stop = len(offsets) if stop is None else min(stop, len(offsets))
+        wanted = (i for i in range(start, stop) if i not in skip)
+
+        # seek once per run of consecutive documents
+        with open(self.path, 'rb') as f:
+            for _, run in itertools.groupby(enumerate(wanted), lambda e: e[1] - e[0]):
+                indices = [i for _, i in run]
+                f.seek(offsets[indices[0]])
+                yield from itertools.islice(self.yaml.load_all(f), len(indices))
+
+
+    def read_document(self, index : int) -> Any:
+        """
+        Returns a single document from the file, parsing only that one.
+
+
+        Parameters
+        ----------
+        index : int
+            Index of the document.
+
+
+        Returns
+        -------
+        Any
+            The document.
+
+
+        Raises
+        ------
+        IndexError
+            If the file has no document at `index`.
+        """
+
+        offsets = self.document_offsets()
+        if not 0 <= index < len(offsets):
+            raise IndexError(f'No document {index} in file {self.path}')
+        return next(self.iter_documents(index, index + 1))
+
+
+    def read_documents_parallel(
+        self,
+        processes : int | None = None,
+        documents_per_task : int = 256
+    ) -> list[Any]:
+        """
+        Parses every document in the file, splitting the documents into
+        ranges parsed in parallel by a pool of processes.
+
+
+        Parameters
+        ----------
+        processes : int | None, default = None
+            Number of worker processes, None for one per CPU.
+
+        documents_per_task : int, default = 256
+            Number of documents each worker parses at a time.
+
+
+        Returns
+        -------
+        list[Any]
+            The documents, in file order.
+
+
+        Raises
+        ------
+        ValueError
+            If `documents_per_task` is less than 1.
+        """
+
+        if documents_per_task < 1:
+            raise ValueError('documents_per_task must be at least 1')
+
+        offsets = self.document_offsets()
+        if not offsets:
+            return []
+        boundaries = list(offsets[::documents_per_task]) + [self.path.stat().st_size]
+        ranges = list(zip(boundaries, boundaries[1:]))
+
+        with ProcessPoolExecutor(processes) as executor:
+            parsed = executor.map(
+                load_document_range, 
+                itertools.repeat(self.path), 
+                *zip(*ranges)
+            )
+            return list(itertools.chain.from_iterable(parsed))
+
+
+    def open_writer(
+        self, 
+        on_close : Callable[[], None] | None = None
+    ) -> 'YAMLDocumentWriter':
+        """
+        Opens a session that writes the YAML file one document at a time,
+        each starting with a `---` marker.
+
+
+        Parameters
+        ----------
+        on_close : Callable[[], None] | None, default = None
+            Called once the session is committed or aborted.
+
+
+        Returns
+        -------
+        YAMLDocumentWriter
+            The session, which replaces the file when closed.
+        """
+        return YAMLDocumentWriter(self.path, on_close = on_close)
+
+
+
+class YAMLDocumentWriter(WriterSession):
+    """
+    Writes a multi-document YAML file, one document at a time.
+    """
+
+
+    def _begin(self) -> None:
+        self._yaml = YAML(typ='safe')
+        self._yaml.explicit_start = True
+
+
+    def write_document(self, document : Any) -> None:
+        """
+        Writes a document.
+        """
+
+        self._check_open()
+        self._yaml.dump(encode(document), self._file)
+
+
+
+def _is_document_start(line : bytes) -> bool:
+    """
+    Determines if a line is a `---` document start marker.
+    """
+    return line.startswith(DOCUMENT_START) and line[3:4] in MARKER_ENDINGS
+
+
+def _is_document_end(line : bytes) -> bool:
+    """
+    Determines if a line is a `...` document end marker.
+    """
+    return line.startswith(DOCUMENT_END) and line[3:4] in MARKER_ENDINGS
+
+
+def _is_content(line : bytes) -> bool:
+    """
+    Determines if a line holds content, rather than being blank, a comment
+    or a directive.
+    """
+    return bool(line.strip()) and not line.startswith((b'#', b'%'))
+
+
+def load_document_range(path : Path, start : int, end : int) -> list[Any]:
+    """
+    Parses the documents between two byte offsets of a YAML file, as
+    given by `YAMLFile.document_offsets()`. Module level so that it can
+    run in a worker process.
+
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Absolute path of the YAML file.
+
+    start : int
+        Offset of the first document in the range.
+
+    end : int
+        Offset after the last document in the range.
+
+
+    Returns
+    -------
+    list[Any]
+        The documents in the range.
+    """
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return list(YAML(typ='safe').load_all(f.read(end - start)))
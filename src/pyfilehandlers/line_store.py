@@ -0,0 +1,304 @@
+"""line_store.py
+
+Contains a class that holds the lines of a text file in a single buffer.
+"""
+
+import bisect
+import itertools
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+
+from typing import Iterator, Self, overload
+
+
+SCAN_CHUNK_SIZE = 1 << 20
+LINE_FEED = 10
+CARRIAGE_RETURN = 13
+
+
+
+class LineStore(Sequence):
+    """
+    An immutable sequence of the lines of a text file, held as the file's
+    raw bytes plus an `array('Q')` of line offsets.
+
+    Each line costs 8 bytes on top of its text, rather than a Python
+    string object, and is only decoded into a `str` when it is indexed or
+    iterated over. Lines are returned without their line endings, which
+    may be `\\n`, `\\r\\n` or `\\r`. Slices share the buffer of the store
+    they are taken from.
+
+
+    Attributes
+    ----------
+    encoding : str
+        Encoding used to decode lines.
+    """
+
+
+    def __init__(
+        self,
+        buffer : bytes,
+        offsets : array,
+        encoding : str = 'utf-8'
+    ) -> None:
+        """
+        Initializes LineStore instance.
+
+
+        Parameters
+        ----------
+        buffer : bytes
+            The raw bytes of the text.
+
+        offsets : array.array
+            Offset of the start of each line, followed by the offset of the
+            end of the last line, as `array('Q')`.
+
+        encoding : str, default = 'utf-8'
+            Encoding used to decode lines.
+        """
+
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._offsets = offsets
+        self.encoding = encoding
+
+
+    @classmethod
+    def from_bytes(cls, buffer : bytes, encoding : str = 'utf-8') -> Self:
+        """
+        Indexes the lines of some text.
+
+
+        Parameters
+        ----------
+        buffer : bytes
+            The raw bytes of the text.
+
+        encoding : str, default = 'utf-8'
+            Encoding used to decode lines.
+
+
+        Returns
+        -------
+        LineStore
+            The lines of the text.
+        """
+
+        offsets = array('Q')
+        position = 0
+        size = len(buffer)
+
+        # split a chunk at a time, cutting each chunk after its last line
+        # feed so that no line, including a \r\n ending, spans two chunks
+        while position < size:
+            end = min(position + SCAN_CHUNK_SIZE, size)
+            if end < size:
+                cut = buffer.rfind(b'\n', position, end)
+                while cut == -1 and end < size:
+                    end = min(end + SCAN_CHUNK_SIZE, size)
+                    cut = buffer.rfind(b'\n', position, end)
+                if end < size:
+                    end = cut + 1
+
+            lengths = map(len, buffer[position:end].splitlines(keepends = True))
+            offsets.extend(itertools.accumulate(lengths, initial = position))
+            offsets.pop()
+            position = end
+
+        offsets.append(size)
+        return cls(buffer, offsets, encoding)
+
+
+    @classmethod
+    def from_file(cls, path : Path, encoding : str = 'utf-8') -> Self:
+        """
+        Reads and indexes the lines of a text file.
+
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            Path of the file.
+
+        encoding : str, default = 'utf-8'
+            Encoding used to decode lines.
+
+
+        Returns
+        -------
+        LineStore
+            The lines of the file.
+        """
+
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read(), encoding)
+
+
+    def _line_end(self, index : int) -> int:
+        """
+        Returns the offset of the end of a line, before its line ending.
+        """
+
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        buffer = self._buffer
+        if end > start and buffer[end - 1] == LINE_FEED:
+            end -= 1
+        if end > start and buffer[end - 1] == CARRIAGE_RETURN:
+            end -= 1
+        return end
+
+
+    def _decode(self, index : int) -> str:
+        """
+        Returns a line as a string.
+        """
+        return str(
+            self._view[self._offsets[index]:self._line_end(index)],
+            self.encoding
+        )
+
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+    @overload
+    def __getitem__(self, index : int) -> str: ...
+
+    @overload
+    def __getitem__(self, index : slice) -> 'LineStore | list[str]': ...
+
+    def __getitem__(self, index):
+        """
+        Returns a line, or for a slice, the lines in it. Contiguous slices
+        are returned as a LineStore sharing this store's buffer, stepped
+        slices as a list.
+        """
+
+        length = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            if step != 1:
+                return [self._decode(i) for i in range(start, stop, step)]
+            stop = max(start, stop)
+            return LineStore(
+                self._buffer, self._offsets[start:stop + 1], self.encoding
+            )
+
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('LineStore index out of range')
+        return self._decode(index)
+
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self._decode(index)
+
+
+    def find(self, text : str, start : int = 0) -> int:
+        """
+        Returns the index of the first line containing some text, searching
+        the raw buffer rather than decoding every line.
+
+
+        Parameters
+        ----------
+        text : str
+            The text to search for, which must not contain a line ending.
+
+        start : int, default = 0
+            Index of the first line to search.
+
+
+        Returns
+        -------
+        int
+            The index of the line.
+            -1, if no line contains the text.
+        """
+
+        if not len(self) or start >= len(self):
+            return -1
+
+        needle = text.encode(self.encoding)
+        position = self._offsets[max(0, start)]
+        limit = self._offsets[-1]
+
+        while (found := self._buffer.find(needle, position, limit)) != -1:
+            index = bisect.bisect_right(self._offsets, found) - 1
+            if found + len(needle) <= self._line_end(index):
+                return index
+            position = found + 1
+
+        return -1
+
+
+    def index(self, value : str, start : int = 0, stop : int | None = None) -> int:
+        """
+        Returns the index of the first line equal to a value.
+
+
+        Raises
+        ------
+        ValueError
+            If no line is equal to the value.
+        """
+
+        stop = len(self) if stop is None else min(stop, len(self))
+        index = self.find(value, start)
+        while index != -1 and index < stop:
+            if self._decode(index) == value:
+                return index
+            index = self.find(value, index + 1)
+        raise ValueError(f'{value!r} is not in LineStore')
+
+
+    def __contains__(self, value : object) -> bool:
+        if not isinstance(value, str):
+            return False
+        try:
+            self.index(value)
+            return True
+        except ValueError:
+            return False
+
+
+    def count(self, value : str) -> int:
+        """
+        Returns the number of lines equal to a value.
+        """
+
+        total = 0
+        index = self.find(value)
+        while index != -1:
+            total += self._decode(index) == value
+            index = self.find(value, index + 1)
+        return total
+
+
+    def bisect_left(self, value : str) -> int:
+        """
+        Returns where a value would be inserted into sorted lines, before
+        any equal lines. Only lines compared along the way are decoded.
+        """
+        return bisect.bisect_left(self, value)
+
+
+    def bisect_right(self, value : str) -> int:
+        """
+        Returns where a value would be inserted into sorted lines, after
+        any equal lines. Only lines compared along the way are decoded.
+        """
+        return bisect.bisect_right(self, value)
+
+
+    def __repr__(self) -> str:
+        size = self._offsets[-1] - self._offsets[0]
+        return f'LineStore({len(self)} lines, {size} bytes)'
@@ -0,0 +1,416 @@
+"""schema.py
+
+Contains functions that decode parsed JSON/YAML data into typed records,
+such as `__slots__` dataclasses and NamedTuples, and encode them back.
+"""
+
+import dataclasses
+import functools
+import types
+import typing
+
+
+from typing import Any, Callable
+
+
+Decoder = Callable[[Any], Any]
+Encoder = Callable[[Any], Any]
+
+PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+
+class SchemaError(ValueError):
+    """
+    Raised when data does not match the schema it is decoded into.
+
+
+    Attributes
+    ----------
+    path : list[str]
+        Location of the mismatch within the data, outermost first.
+
+    message : str
+        Description of the mismatch.
+    """
+
+
+    def __init__(self, message : str) -> None:
+        """
+        Initializes SchemaError instance.
+
+
+        Parameters
+        ----------
+        message : str
+            Description of the mismatch.
+        """
+
+        super().__init__(message)
+        self.path : list[str] = []
+        self.message = message
+
+
+    def __str__(self) -> str:
+        location = '.'.join(self.path) or '<root>'
+        return f'{location}: {self.message}'
+
+
+
+def decode(data : Any, schema : Any) -> Any:
+    """
+    Decodes parsed data into instances of a schema, validating it along
+    the way.
+
+
+    Parameters
+    ----------
+    data : Any
+        Data as parsed from JSON or YAML.
+
+    schema : Any
+        The type to decode into, such as a dataclass, a NamedTuple, or a
+        generic such as `list[Record]` or `dict[str, Record]`.
+
+
+    Returns
+    -------
+    Any
+        The decoded data.
+
+
+    Raises
+    ------
+    SchemaError
+        If the data does not match the schema.
+    """
+    return compile_decoder(schema)(data)
+
+
+def encode(value : Any) -> Any:
+    """
+    Encodes typed records back into data that JSON or YAML can represent.
+
+    Dataclasses become dicts, NamedTuples and tuples become lists.
+
+
+    Parameters
+    ----------
+    value : Any
+        The data to encode.
+
+
+    Returns
+    -------
+    Any
+        The encoded data.
+    """
+
+    if isinstance(value, PRIMITIVE_TYPES):
+        return value
+    return _compile_encoder(type(value))(value)
+
+
+@functools.cache
+def compile_decoder(schema : Any) -> Decoder:
+    """
+    Returns a function that decodes parsed data into a schema.
+
+    Decoders are compiled once per schema and cached, so the type hints of
+    a record are only inspected the first time it is decoded.
+
+
+    Parameters
+    ----------
+    schema : Any
+        The type to decode into.
+
+
+    Returns
+    -------
+    Callable[[Any], Any]
+        The decoder for the schema.
+
+
+    Raises
+    ------
+    TypeError
+        If the schema contains a type that can not be decoded into.
+    """
+
+    if schema is Any or schema is object:
+        return _identity
+
+    origin = typing.get_origin(schema)
+    args = typing.get_args(schema)
+
+    if origin in (typing.Union, types.UnionType):
+        return _union_decoder(args)
+    if origin is typing.Literal:
+        return _literal_decoder(args)
+    if origin in (list, tuple) and (origin is list or args[-1:] == (...,)):
+        return _list_decoder(origin, args[0] if args else Any)
+    if origin is dict:
+        return _dict_decoder(args[1] if args else Any)
+    if schema in (list, dict, tuple):
+        return compile_decoder(schema[Any, Any] if schema is dict else schema[Any])
+
+    if dataclasses.is_dataclass(schema):
+        return _record_decoder(schema, _dataclass_fields(schema), False)
+    if (isinstance(schema, type) and issubclass(schema, tuple)
+            and hasattr(schema, '_fields')):
+        return _record_decoder(schema, _namedtuple_fields(schema), True)
+
+    if schema in PRIMITIVE_TYPES or schema is None:
+        return _primitive_decoder(type(None) if schema is None else schema)
+
+    raise TypeError(f'Can not decode into type {schema!r}')
+
+
+
+def _identity(data : Any) -> Any:
+    return data
+
+
+def _primitive_decoder(schema : type) -> Decoder:
+    """
+    Returns a decoder that checks data is an instance of a primitive type.
+    Integers are accepted as floats, booleans are not accepted as integers.
+    """
+
+    if schema is float:
+        def decode_float(data : Any) -> float:
+            if isinstance(data, float):
+                return data
+            if isinstance(data, int) and not isinstance(data, bool):
+                return float(data)
+            raise SchemaError(f'expected float, got {type(data).__name__}')
+        return decode_float
+
+    def decode_primitive(data : Any) -> Any:
+        if type(data) is schema or (
+            isinstance(data, schema) and not isinstance(data, bool)
+        ):
+            return data
+        raise SchemaError(
+            f'expected {schema.__name__}, got {type(data).__name__}'
+        )
+    return decode_primitive
+
+
+def _union_decoder(args : tuple) -> Decoder:
+    """
+    Returns a decoder that tries each member of a union in order.
+    """
+
+    decoders = [compile_decoder(arg) for arg in args]
+    names = ' | '.join(getattr(arg, '__name__', repr(arg)) for arg in args)
+
+    def decode_union(data : Any) -> Any:
+        for decoder in decoders:
+            try:
+                return decoder(data)
+            except SchemaError:
+                pass
+        raise SchemaError(f'expected {names}, got {type(data).__name__}')
+    return decode_union
+
+
+def _literal_decoder(args : tuple) -> Decoder:
+    """
+    Returns a decoder that checks data is one of a set of values.
+    """
+
+    def decode_literal(data : Any) -> Any:
+        if data in args:
+            return data
+        raise SchemaError(f'expected one of {args!r}, got {data!r}')
+    return decode_literal
+
+
+def _list_decoder(origin : type, item_schema : Any) -> Decoder:
+    """
+    Returns a decoder for a homogeneous list or variable-length tuple.
+    """
+
+    decode_item = compile_decoder(item_schema)
+
+    def decode_list(data : Any) -> Any:
+        if not isinstance(data, list):
+            raise SchemaError(f'expected list, got {type(data).__name__}')
+
+        if decode_item is _identity:
+            return origin(data)
+
+        items = []
+        append = items.append
+        for index, item in enumerate(data):
+            try:
+                append(decode_item(item))
+            except SchemaError as e:
+                e.path.insert(0, str(index))
+                raise
+        return items if origin is list else origin(items)
+    return decode_list
+
+
+def _dict_decoder(value_schema : Any) -> Decoder:
+    """
+    Returns a decoder for a mapping with homogeneous values.
+    """
+
+    decode_value = compile_decoder(value_schema)
+
+    def decode_dict(data : Any) -> dict:
+        if not isinstance(data, dict):
+            raise SchemaError(f'expected mapping, got {type(data).__name__}')
+
+        if decode_value is _identity:
+            return data
+
+        decoded = {}
+        for key, value in data.items():
+            try:
+                decoded[key] = decode_value(value)
+            except SchemaError as e:
+                e.path.insert(0, str(key))
+                raise
+        return decoded
+    return decode_dict
+
+
+def _dataclass_fields(schema : type) -> list[tuple[str, Any, bool]]:
+    """
+    Returns the name, type and whether it is required for each field
+    of a dataclass that can be passed to its constructor.
+    """
+
+    hints = typing.get_type_hints(schema)
+    return [
+        (
+            field.name,
+            hints.get(field.name, Any),
+            field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING
+        )
+        for field in dataclasses.fields(schema)
+        if field.init
+    ]
+
+
+def _namedtuple_fields(schema : type) -> list[tuple[str, Any, bool]]:
+    """
+    Returns the name, type and whether it is required for each field
+    of a NamedTuple.
+    """
+
+    hints = typing.get_type_hints(schema)
+    return [
+        (name, hints.get(name, Any), name not in schema._field_defaults)
+        for name in schema._fields
+    ]
+
+
+def _record_decoder(
+    schema : type,
+    fields : list[tuple[str, Any, bool]],
+    positional : bool
+) -> Decoder:
+    """
+    Returns a decoder that builds a record from a mapping of field names,
+    or for NamedTuples, also from a list of field values.
+
+    Field decoders are compiled on first use, so that records may refer
+    to themselves, such as a tree node holding a list of nodes. They are
+    built before being published in a single assignment, so that threads
+    sharing the decoder never see them partly compiled.
+    """
+
+    names = frozenset(name for name, _, _ in fields)
+    required = [name for name, _, is_required in fields if is_required]
+    compiled : tuple[list[tuple[str, Decoder]], list[Decoder]] | None = None
+    schema_name = schema.__name__
+
+    def decode_record(data : Any) -> Any:
+        nonlocal compiled
+        if compiled is None:
+            field_decoders = [
+                (name, compile_decoder(hint)) for name, hint, _ in fields
+            ]
+            compiled = (
+                field_decoders, [decoder for _, decoder in field_decoders]
+            )
+        decoders, by_position = compiled
+
+        if positional and isinstance(data, list):
+            if not len(required) <= len(data) <= len(fields):
+                raise SchemaError(
+                    f'expected {len(fields)} values for {schema_name}, '
+                    f'got {len(data)}'
+                )
+            values = []
+            for (name, _), decoder, item in zip(decoders, by_position, data):
+                try:
+                    values.append(decoder(item))
+                except SchemaError as e:
+                    e.path.insert(0, name)
+                    raise
+            return schema(*values)
+
+        if not isinstance(data, dict):
+            raise SchemaError(
+                f'expected mapping for {schema_name}, got {type(data).__name__}'
+            )
+
+        # fast path for the common case of every field being present,
+        # anything else is diagnosed field by field below
+        if len(data) == len(decoders):
+            try:
+                return schema(**{
+                    name: decoder(data[name]) for name, decoder in decoders
+                })
+            except (KeyError, SchemaError):
+                pass
+
+        if not names.issuperset(data):
+            unknown = ', '.join(sorted(map(str, data.keys() - names)))
+            raise SchemaError(f'unknown fields for {schema_name}: {unknown}')
+
+        kwargs = {}
+        for name, decoder in decoders:
+            if name in data:
+                try:
+                    kwargs[name] = decoder(data[name])
+                except SchemaError as e:
+                    e.path.insert(0, name)
+                    raise
+
+        if len(kwargs) < len(required):
+            missing = ', '.join(name for name in required if name not in kwargs)
+            raise SchemaError(f'missing fields for {schema_name}: {missing}')
+
+        return schema(**kwargs)
+    return decode_record
+
+
+@functools.cache
+def _compile_encoder(value_type : type) -> Encoder:
+    """
+    Returns a function that encodes values of a type, compiled once per
+    type and cached.
+    """
+
+    if dataclasses.is_dataclass(value_type):
+        names = [
+            field.name for field in dataclasses.fields(value_type) if field.init
+        ]
+        return lambda value: {
+            name: encode(getattr(value, name)) for name in names
+        }
+    if issubclass(value_type, (list, tuple)):
+        return lambda value: [encode(item) for item in value]
+    if issubclass(value_type, dict):
+        return lambda value: {
+            key: encode(item) for key, item in value.items()
+        }
+    return _identity
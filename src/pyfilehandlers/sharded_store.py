@@ -0,0 +1,349 @@
+"""sharded_store.py
+
+Contains a class that stores a large persistent mapping across many
+small files.
+"""
+
+import hashlib
+import shutil
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+
+from .file_handler import FileHandler
+
+
+from typing import Any, Iterator, Self
+
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_SHARD_COUNT = 64
+DEFAULT_MAX_CACHED_SHARDS = 16
+DEFAULT_MAX_DIRTY_SHARDS = 8
+
+# extensions whose files hold a mapping
+MAPPING_EXTENSIONS = ('.json', '.yaml')
+
+
+
+class ShardedStore(MutableMapping):
+    """
+    A persistent dict-like store that hashes its keys into a fixed number
+    of shard files, so that getting or setting a key only reads or writes
+    one small file.
+
+    Shards are loaded on first use and kept in a least recently used
+    cache. Changed shards are written back in batches, when too many are
+    waiting, when they are evicted from the cache, or on `flush()`. A
+    manifest file records the shard count, extension and the number of
+    keys in each shard.
+
+
+    Attributes
+    ----------
+    directory : pathlib.Path
+        Absolute path of the directory holding the store.
+
+    shard_count : int
+        Number of shard files keys are spread across.
+
+    extension : str
+        Extension of the shard files, such as '.json'.
+
+    max_cached_shards : int
+        Number of shards kept in memory at once.
+
+    max_dirty_shards : int
+        Number of changed shards that may wait before all are written.
+    """
+
+
+    def __init__(
+        self,
+        directory : Path,
+        shard_count : int | None = None,
+        extension : str = '.json',
+        max_cached_shards : int = DEFAULT_MAX_CACHED_SHARDS,
+        max_dirty_shards : int = DEFAULT_MAX_DIRTY_SHARDS
+    ) -> None:
+        """
+        Initializes ShardedStore instance, opening the store in `directory`
+        or creating it if there is none.
+
+
+        Parameters
+        ----------
+        directory : pathlib.Path
+            The relative or absolute path of the directory holding the
+            store.
+
+        shard_count : int | None, default = None
+            Number of shards for a new store, or None for 64. For an
+            existing store, None or its current shard count.
+
+        extension : str, default = '.json'
+            Extension of the shard files for a new store, ignored for an
+            existing store.
+
+        max_cached_shards : int, default = 16
+            Number of shards kept in memory at once.
+
+        max_dirty_shards : int, default = 8
+            Number of changed shards that may wait before all are written.
+
+
+        Raises
+        ------
+        ValueError
+            If `shard_count` does not match an existing store, if the
+            extension's files can not hold a mapping, or if the manifest
+            could not be read.
+        """
+
+        self.directory = FileHandler._resolve_path(Path(directory))
+        self.max_cached_shards = max(1, max_cached_shards)
+        self.max_dirty_shards = max(1, max_dirty_shards)
+
+        self._manifest = FileHandler(
+            self.directory / MANIFEST_NAME, create = False, atomic_writes = True
+        )
+        exists = self._manifest.file_exists() and not self._manifest.is_empty()
+        manifest = self._manifest.read() if exists else None
+
+        if exists and not isinstance(manifest, dict):
+            raise ValueError(f'Could not read manifest {self._manifest.path}')
+
+        if manifest is None:
+            if extension not in MAPPING_EXTENSIONS:
+                raise ValueError(f'Shards can not be stored as {extension} files')
+            shard_count = shard_count or DEFAULT_SHARD_COUNT
+            manifest = {
+                'version' : MANIFEST_VERSION,
+                'shard_count' : shard_count,
+                'extension' : extension,
+                'counts' : [0] * shard_count,
+            }
+            self._manifest.write(manifest)
+
+        elif shard_count is not None and shard_count != manifest['shard_count']:
+            raise ValueError(
+                f'Store has {manifest["shard_count"]} shards, '
+                f'use ShardedStore.resize() to change it'
+            )
+
+        self.shard_count : int = manifest['shard_count']
+        self.extension : str = manifest['extension']
+        self._counts : list[int] = manifest['counts']
+
+        self._shards = FileHandler.bulk(
+            (self._shard_path(i) for i in range(self.shard_count)),
+            create = False,
+            atomic_writes = True
+        )
+        self._cache : OrderedDict[int, dict] = OrderedDict()
+        self._dirty : set[int] = set()
+
+
+    @classmethod
+    def resize(cls, directory : Path, shard_count : int) -> Self:
+        """
+        Rehashes an existing store into a new number of shards.
+
+        The store is rebuilt in a sibling directory, then swapped into
+        place. No other process may use the store while it is resized.
+
+
+        Parameters
+        ----------
+        directory : pathlib.Path
+            The relative or absolute path of the directory holding the
+            store.
+
+        shard_count : int
+            The new number of shards.
+
+
+        Returns
+        -------
+        ShardedStore
+            The resized store.
+        """
+
+        old = cls(directory)
+        if old.shard_count == shard_count:
+            return old
+
+        staging = old.directory.with_name(old.directory.name + '.resizing')
+        retired = old.directory.with_name(old.directory.name + '.retired')
+        shutil.rmtree(staging, ignore_errors = True)
+
+        with cls(staging, shard_count, old.extension) as new:
+            for index in range(old.shard_count):
+                new.update(old._load(index))
+
+        old.directory.rename(retired)
+        staging.rename(old.directory)
+        shutil.rmtree(retired)
+
+        return cls(old.directory)
+
+
+    def __enter__(self) -> Self:
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
+    def _shard_path(self, index : int) -> Path:
+        """
+        Returns the path of a shard file.
+        """
+        return self.directory / f'shard-{index:05d}{self.extension}'
+
+
+    def _shard_index(self, key : str) -> int:
+        """
+        Returns the index of the shard holding a key. The hash is stable
+        across processes, unlike the built-in `hash()`.
+
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string.
+        """
+
+        if not isinstance(key, str):
+            raise TypeError(f'ShardedStore keys must be str, not {type(key).__name__}')
+
+        digest = hashlib.blake2b(key.encode(), digest_size = 8).digest()
+        return int.from_bytes(digest) % self.shard_count
+
+
+    def _load(self, index : int) -> dict:
+        """
+        Returns the data of a shard, loading it into the cache if needed.
+
+
+        Raises
+        ------
+        ValueError
+            If the shard file could not be read.
+        """
+
+        shard = self._cache.get(index)
+        if shard is not None:
+            self._cache.move_to_end(index)
+            return shard
+
+        handler = self._shards[index]
+        if handler.file_exists() and not handler.is_empty():
+            shard = handler.read()
+            if not isinstance(shard, dict):
+                raise ValueError(f'Could not read shard {handler.path}')
+        else:
+            shard = {}
+
+        self._cache[index] = shard
+        while len(self._cache) > self.max_cached_shards:
+            evicted, data = self._cache.popitem(last = False)
+            if evicted in self._dirty:
+                self._write_shard(evicted, data)
+                self._write_manifest()
+
+        return shard
+
+
+    def _mark_dirty(self, index : int) -> None:
+        """
+        Records that a shard has changed, writing back every changed shard
+        once too many are waiting.
+        """
+
+        self._dirty.add(index)
+        if len(self._dirty) > self.max_dirty_shards:
+            self.flush()
+
+
+    def _write_shard(self, index : int, data : dict) -> None:
+        """
+        Writes a shard back to its file.
+
+
+        Raises
+        ------
+        OSError
+            If the shard could not be written.
+        """
+
+        if not self._shards[index].write(data):
+            raise OSError(f'Could not write shard {self._shards[index].path}')
+        self._counts[index] = len(data)
+        self._dirty.discard(index)
+
+
+    def _write_manifest(self) -> None:
+        """
+        Writes the manifest, with the current number of keys per shard.
+        """
+
+        self._manifest.write({
+            'version' : MANIFEST_VERSION,
+            'shard_count' : self.shard_count,
+            'extension' : self.extension,
+            'counts' : self._counts,
+        })
+
+
+    def flush(self) -> None:
+        """
+        Writes every changed shard back to its file, then the manifest.
+
+
+        Raises
+        ------
+        OSError
+            If a shard could not be written.
+        """
+
+        if not self._dirty:
+            return
+
+        for index in sorted(self._dirty):
+            self._write_shard(index, self._cache[index])
+        self._write_manifest()
+
+
+    def __getitem__(self, key : str) -> Any:
+        return self._load(self._shard_index(key))[key]
+
+
+    def __setitem__(self, key : str, value : Any) -> None:
+        index = self._shard_index(key)
+        self._load(index)[key] = value
+        self._mark_dirty(index)
+
+
+    def __delitem__(self, key : str) -> None:
+        index = self._shard_index(key)
+        del self._load(index)[key]
+        self._mark_dirty(index)
+
+
+    def __contains__(self, key : object) -> bool:
+        return isinstance(key, str) and key in self._load(self._shard_index(key))
+
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self.shard_count):
+            yield from list(self._load(index))
+
+
+    def __len__(self) -> int:
+        return sum(
+            len(self._cache[index]) if index in self._cache else count
+            for index, count in enumerate(self._counts)
+        )
@@ -0,0 +1,80 @@
+from src.pyfilehandlers.cli import main
+from src.pyfilehandlers.file_handler import FileHandler
+
+from pathlib import Path
+
+
+
+class TestCLI:
+
+
+    def test_convert_json_to_yaml(self, tmp_path : Path):
+        FileHandler(tmp_path / 'a.json').write({'a' : [1, 2]})
+        FileHandler(tmp_path / 'b.json').write([{'b' : 1}])
+
+        status = main(['convert', '--to', 'yaml', '-j', '1', '-o',
+                       str(tmp_path / 'out'), str(tmp_path)])
+
+        assert status == 0
+        assert FileHandler(tmp_path / 'out' / 'a.yaml').read() == {'a' : [1, 2]}
+        assert FileHandler(tmp_path / 'out' / 'b.yaml').read() == [{'b' : 1}]
+
+    def test_convert_skips_up_to_date_outputs(self, tmp_path : Path, capsys):
+        FileHandler(tmp_path / 'a.json').write({'a' : 1})
+        main(['convert', '--to', 'jsonl', '-j', '1', str(tmp_path / '*.json')])
+        capsys.readouterr()
+
+        main(['convert', '--to', 'jsonl', '--dry-run', str(tmp_path / '*.json')])
+
+        assert 'would skip' in capsys.readouterr().out
+
+    def test_dry_run_writes_nothing(self, tmp_path : Path):
+        FileHandler(tmp_path / 'a.json').write({'a' : 1})
+
+        assert main(['convert', '--to', 'txt', '--dry-run', str(tmp_path)]) == 0
+        assert not (tmp_path / 'a.txt').exists()
+
+    def test_validate_reports_failures(self, tmp_path : Path):
+        (tmp_path / 'bad.json').write_text('{bad')
+        FileHandler(tmp_path / 'good.yaml').write({'a' : 1})
+
+        assert main(['validate', '-j', '1', str(tmp_path)]) == 1
+        assert main(['stat', '-j', '1', str(tmp_path / 'good.yaml')]) == 0
+
+    def test_convert_rerun_skips_previous_outputs(self, tmp_path : Path):
+        FileHandler(tmp_path / 'a.json').write({'a' : 1})
+
+        assert main(['convert', '--to', 'yaml', '-j', '1', str(tmp_path)]) == 0
+        assert main(['convert', '--to', 'yaml', '-j', '1', str(tmp_path)]) == 0
+
+    def test_convert_output_dir_keeps_subdirectories(self, tmp_path : Path):
+        FileHandler(tmp_path / 'in' / 'x' / 's.json').write({'x' : 1})
+        FileHandler(tmp_path / 'in' / 'y' / 's.json').write({'y' : 1})
+        out = tmp_path / 'out'
+
+        assert main(['convert', '--to', 'yaml', '-j', '1', '-o', str(out),
+                     str(tmp_path / 'in')]) == 0
+        assert FileHandler(out / 'x' / 's.yaml').read() == {'x' : 1}
+        assert FileHandler(out / 'y' / 's.yaml').read() == {'y' : 1}
+
+    def test_convert_fails_inputs_sharing_an_output(self, tmp_path : Path):
+        FileHandler(tmp_path / 'x' / 's.json').write({'x' : 1})
+        FileHandler(tmp_path / 'y' / 's.json').write({'y' : 1})
+
+        status = main(['convert', '--to', 'yaml', '-j', '1', '-o', str(tmp_path / 'out'),
+                       str(tmp_path / 'x' / 's.json'), str(tmp_path / 'y' / 's.json')])
+
+        assert status == 1
+        assert not (tmp_path / 'out' / 's.yaml').exists()
+
+    def test_convert_reports_results_decided_before_running(self, tmp_path : Path, capsys):
+        FileHandler(tmp_path / 'x' / 's.json').write({'x' : 1})
+        FileHandler(tmp_path / 'y' / 's.json').write({'y' : 1})
+        inputs = [str(tmp_path / 'x' / 's.json'), str(tmp_path / 'y' / 's.json')]
+        out = ['-o', str(tmp_path / 'out')]
+
+        assert main(['convert', '--to', 'yaml', '--dry-run', *out, *inputs]) == 1
+        assert main(['convert', '--to', 'yaml', '-j', '1', *out, *inputs]) == 1
+
+        errors = capsys.readouterr().err
+        assert errors.count('would be written by several inputs') == 4
@@ -0,0 +1,78 @@
+from src.pyfilehandlers.file_copy import copy_file
+from src.pyfilehandlers.file_handler import FileHandler
+
+from datetime import timedelta
+from pathlib import Path
+import os
+import pytest
+
+
+
+class TestFileCopy:
+
+
+    def test_copy_file(self, tmp_path : Path):
+        source = tmp_path / 'source.bin'
+        source.write_bytes(os.urandom(3 << 20))
+
+        method = copy_file(source, tmp_path / 'copy.bin')
+
+        assert method in ('reflink', 'copy_file_range', 'sendfile', 'read')
+        assert (tmp_path / 'copy.bin').read_bytes() == source.read_bytes()
+
+    def test_copy_file_keeps_source_mode(self, tmp_path : Path):
+        source = tmp_path / 'script.sh'
+        source.write_text('echo hi\n')
+        source.chmod(0o750)
+        (tmp_path / 'copy.sh').write_text('')
+
+        copy_file(source, tmp_path / 'copy.sh')
+
+        assert (tmp_path / 'copy.sh').stat().st_mode & 0o777 == 0o750
+
+    def test_copy_to_includes_journal(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json')
+        fh.write({'count' : 0, 'padding' : 'x' * 1000})
+        fh.update({'count' : 1})
+
+        copy = fh.copy_to(tmp_path / 'backup' / 'state.json')
+
+        assert copy.read()['count'] == 1
+
+    def test_move_to(self, tmp_path : Path):
+        fh = FileHandler.intern(tmp_path / 'state.json', locking = True)
+        fh.write({'a' : 1})
+
+        fh.move_to(tmp_path / 'moved.json')
+
+        assert not (tmp_path / 'state.json').exists()
+        assert not (tmp_path / 'state.json.lock').exists()
+        assert fh.path == tmp_path / 'moved.json'
+        assert fh.read() == {'a' : 1}
+        assert FileHandler.intern(tmp_path / 'moved.json') is fh
+
+    def test_snapshot_retention(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'world.json')
+        # a snapshot of another file, whose name also matches world.*.json
+        decoy = FileHandler(tmp_path / 'world.backup.json')
+        decoy.write({})
+        decoy_snapshot = decoy.snapshot().path
+        assert decoy_snapshot.parent == tmp_path / '.snapshots'
+
+        for i in range(5):
+            fh.write({'version' : i})
+            fh.snapshot(keep = 3)
+
+        snapshots = fh.snapshots()
+        assert len(snapshots) == 3
+        assert FileHandler(snapshots[-1]).read() == {'version' : 4}
+
+        assert decoy_snapshot not in snapshots
+
+        fh.snapshot(keep = None, max_age = timedelta(0))
+        assert len(fh.snapshots()) == 1
+        assert decoy_snapshot.exists()
+
+    def test_snapshot_rejects_keeping_none(self, tmp_path : Path):
+        with pytest.raises(ValueError):
+            FileHandler(tmp_path / 'world.json').snapshot(keep = 0)
@@ -0,0 +1,59 @@
+from src.pyfilehandlers.file_handler import FileHandler
+from src.pyfilehandlers.file_csv import CSVFile
+
+from array import array
+from pathlib import Path
+import math
+
+
+
+class TestCSVFile:
+
+
+    def test__determine_file_extension_object_CSVFile(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'table.tsv')
+
+        assert isinstance(fh.extension, CSVFile)
+        assert fh.extension.delimiter == '\t'
+
+    def test_write_and_iter_rows(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'table.csv')
+
+        assert fh.write(([str(i), f'name, {i}'] for i in range(25_000)))
+        rows = fh.extension.iter_rows()
+
+        assert next(rows) == ['0', 'name, 0']
+        assert sum(1 for _ in rows) == 24_999
+
+    def test_read_columns_infers_types(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'table.csv')
+        fh.write([
+            ['id', 'score', 'name'],
+            ['1', '2.5', 'a'],
+            ['2', '', 'b'],
+            ['3', '4', '5'],
+        ])
+
+        columns = fh.extension.read_columns()
+
+        assert columns['id'] == array('q', [1, 2, 3])
+        assert columns['score'].typecode == 'd'
+        assert math.isnan(columns['score'][1])
+        assert columns['name'] == ['a', 'b', '5']
+
+    def test_read_columns_skips_blank_lines(self, tmp_path : Path):
+        path = tmp_path / 'table.csv'
+        path.write_text('a,b\n1,2\n\n3,4\n\n')
+
+        columns = FileHandler(path).extension.read_columns()
+
+        assert columns == {'a' : array('q', [1, 3]), 'b' : array('q', [2, 4])}
+
+    def test_read_columns_demotes_out_of_range_ints(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'table.csv')
+        fh.write([['big', 'small'], ['1', '1'], ['99999999999999999999', '-2']])
+
+        columns = fh.extension.read_columns()
+
+        assert columns['big'] == array('d', [1.0, 1e20])
+        assert columns['small'] == array('q', [1, -2])
@@ -41,3 +41,55 @@ class TestFileHandler:
     def test__determine_file_extension_object_no_ext_handler(self):
         with pytest.raises(ValueError):
             FileHandler(Path('test.sh'))
+
+
+    def test_create_false_is_lazy(self, tmp_path : Path):
+        path_to_test = tmp_path / 'nested' / 'lazy.json'
+
+        fh = FileHandler(path_to_test, create = False)
+        assert not path_to_test.exists()
+        assert fh.read() is None
+
+        assert fh.write({'a' : 1})
+        assert fh.read() == {'a' : 1}
+
+    def test_read_rejects_unsupported_options(self, tmp_path : Path):
+        json_file = FileHandler(tmp_path / 'data.json')
+        txt_file = FileHandler(tmp_path / 'data.txt')
+
+        with pytest.raises(TypeError):
+            json_file.read(compact = True)
+        with pytest.raises(TypeError):
+            txt_file.read(schema = list[str])
+        with pytest.raises(ValueError):
+            txt_file.read(schema = list[str], compact = True)
+
+    def test_intern_returns_same_handler(self, tmp_path : Path):
+        fh = FileHandler.intern(tmp_path / 'interned.txt', create = False)
+
+        assert FileHandler.intern(tmp_path / '.' / 'interned.txt') is fh
+        (tmp_path / 'sub').mkdir()
+        assert FileHandler.intern(tmp_path / 'sub' / '..' / 'interned.txt') is fh
+
+    def test_bulk_creates_files(self, tmp_path : Path):
+        paths = [tmp_path / f'dir{i % 3}' / f'file{i}.txt' for i in range(9)]
+
+        handlers = FileHandler.bulk(paths)
+
+        assert [fh.path for fh in handlers] == paths
+        assert all(path.exists() for path in paths)
+        assert FileHandler.bulk(paths[:1], create = False)[0] is handlers[0]
+
+    def test_raw_bytes_round_trip(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'raw.json', create = False)
+        data = b'{"a": 1}' * 100
+
+        assert fh.write_bytes(memoryview(data))
+        assert fh.read_bytes() == data
+
+        buffer = bytearray(len(data) + 10)
+        assert fh.readinto(buffer) == len(data)
+        assert buffer[:len(data)] == data
+
+        chunks = b''.join(bytes(chunk) for chunk in fh.iter_chunks(64))
+        assert chunks == data
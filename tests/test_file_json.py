@@ -0,0 +1,101 @@
+from src.pyfilehandlers.file_handler import FileHandler
+from src.pyfilehandlers import file_json
+from src.pyfilehandlers.file_json import merge_patch
+
+from pathlib import Path
+import pytest
+
+
+
+class TestJSONFile:
+
+
+    def test_merge_patch(self):
+        target = {'a' : {'b' : 1, 'c' : 2}, 'd' : 3}
+
+        patched = merge_patch(target, {'a' : {'b' : None, 'e' : 4}, 'd' : [5]})
+
+        assert patched == {'a' : {'c' : 2, 'e' : 4}, 'd' : [5]}
+
+    def test_update_appends_to_journal(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json')
+        fh.write({'count' : 0, 'items' : {}, 'padding' : 'x' * 1000})
+        base = fh.path.read_bytes()
+
+        assert fh.update({'count' : 1})
+        assert fh.update({'items' : {'a' : True}})
+
+        assert fh.path.read_bytes() == base
+        assert fh.extension.journal_path.exists()
+        assert fh.read() == {'count' : 1, 'items' : {'a' : True}, 'padding' : 'x' * 1000}
+
+    def test_update_compacts_past_threshold(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json')
+        fh.write({'count' : 0})
+        fh.extension.journal_max_ratio = 1000
+        fh.extension.journal_max_bytes = 200
+
+        for i in range(1, 30):
+            assert fh.update({'count' : i})
+
+        assert fh.read() == {'count' : 29}
+        journal = fh.extension.journal_path
+        assert not journal.exists() or journal.stat().st_size <= 200
+
+    def test_update_keeps_journal_of_small_file(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json')
+        fh.write({'count' : 0, 'name' : 'small'})
+        inode = fh.path.stat().st_ino
+
+        for i in range(1, 6):
+            assert fh.update({'count' : i})
+
+        assert fh.path.stat().st_ino == inode
+        assert fh.extension.journal_path.exists()
+        assert fh.read() == {'count' : 5, 'name' : 'small'}
+
+    def test_write_discards_journal(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json', atomic_writes = True)
+        fh.extension.journal_max_ratio = 1000
+        fh.write({'count' : 0})
+        fh.update({'count' : 1})
+
+        fh.write({'count' : 10})
+
+        assert fh.read() == {'count' : 10}
+        assert not fh.extension.journal_path.exists()
+
+    def test_writer_discards_journal(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json')
+        fh.extension.journal_max_ratio = 1000
+        fh.write({'count' : 0})
+        fh.update({'count' : 1})
+
+        with fh.open_writer(mode = 'object') as writer:
+            writer.put('count', 5)
+
+        assert fh.read() == {'count' : 5}
+        assert not fh.extension.journal_path.exists()
+
+    def test_read_ignores_journal_of_replaced_file(self, tmp_path, monkeypatch):
+        fh = FileHandler(tmp_path / 'state.json', atomic_writes = True)
+        fh.extension.journal_max_ratio = 1000
+        fh.write({'a' : 0})
+        load = file_json.json.load
+
+        def load_then_replace(f):
+            # another process replaces the file while this read parses it
+            monkeypatch.setattr(file_json.json, 'load', load)
+            data = load(f)
+            fh.write({'a' : 1})
+            fh.update({'b' : 1})
+            return data
+
+        monkeypatch.setattr(file_json.json, 'load', load_then_replace)
+
+        assert fh.read() == {'a' : 0}
+        assert fh.read() == {'a' : 1, 'b' : 1}
+
+    def test_update_requires_json(self, tmp_path : Path):
+        with pytest.raises(TypeError):
+            FileHandler(tmp_path / 'state.txt').update({'a' : 1})
@@ -0,0 +1,85 @@
+from src.pyfilehandlers.file_handler import FileHandler
+from src.pyfilehandlers.file_lock import ReadWriteLock, file_lock
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+
+
+
+class TestFileLock:
+
+
+    def test_ReadWriteLock_readers_share(self):
+        lock = ReadWriteLock()
+
+        assert lock.acquire_read(timeout=0)
+        assert lock.acquire_read(timeout=0)
+        assert not lock.acquire_write(timeout=0)
+
+        lock.release_read()
+        lock.release_read()
+        assert lock.acquire_write(timeout=0)
+        assert not lock.acquire_read(timeout=0)
+        lock.release_write()
+
+    def test_threads_share_yaml_handler(self, tmp_path : Path):
+        data = {'items' : [{'index' : i, 'name' : f'item {i}'} for i in range(200)]}
+        fh = FileHandler.intern(tmp_path / 'shared.yaml')
+        fh.write(data)
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: fh.read(), range(16)))
+
+        assert results == [data] * 16
+
+    def test_file_lock_exclusive_times_out(self, tmp_path : Path):
+        path = tmp_path / 'state.json'
+
+        with file_lock(path, shared=True):
+            with file_lock(path, shared=True, timeout=0):
+                pass
+
+            with pytest.raises(TimeoutError):
+                with file_lock(path, shared=False, timeout=0.05):
+                    pass
+
+
+
+    def test_atomic_write_round_trip(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json', locking=True, atomic_writes=True)
+
+        assert fh.write({'count' : 1})
+        assert fh.read() == {'count' : 1}
+        names = sorted(path.name for path in tmp_path.iterdir())
+        assert names == ['state.json', 'state.json.lock']
+
+    def test_atomic_write_new_file_mode(self, tmp_path : Path):
+        atomic = FileHandler(tmp_path / 'atomic.json', create=False, atomic_writes=True)
+        plain = FileHandler(tmp_path / 'plain.json', create=False)
+
+        assert atomic.write({}) and plain.write({})
+        assert atomic.path.stat().st_mode == plain.path.stat().st_mode
+
+    def test_write_if_unchanged_state(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json', locking=True)
+        fh.write({'count' : 1})
+
+        state = fh.file_state()
+        other = FileHandler(tmp_path / 'state.json', atomic_writes=True)
+        other.write({'count' : 5})
+
+        assert not fh.write_if_unchanged({'count' : 2}, state)
+        assert fh.read() == {'count' : 5}
+
+        assert fh.write_if_unchanged({'count' : 6}, fh.file_state())
+        assert fh.read() == {'count' : 6}
+
+    def test_write_if_unchanged_digest(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'state.json')
+        fh.write({'count' : 1})
+
+        digest = fh.file_digest()
+        assert fh.write_if_unchanged({'count' : 2}, digest)
+        assert not fh.write_if_unchanged({'count' : 3}, digest)
+        assert fh.read() == {'count' : 2}
@@ -0,0 +1,79 @@
+from src.pyfilehandlers.file_handler import FileHandler
+
+from pathlib import Path
+import os
+import pytest
+
+
+
+class TestWriterSession:
+
+
+    def test_txt_writer(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'lines.txt')
+
+        with fh.open_writer() as writer:
+            writer.write_lines(f'line {i}' for i in range(3))
+
+        assert fh.read() == ['line 0\n', 'line 1\n', 'line 2\n']
+
+    def test_json_array_and_object_writers(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'data.json')
+
+        with fh.open_writer() as writer:
+            for i in range(3):
+                writer.append({'i' : i})
+        assert fh.read() == [{'i' : 0}, {'i' : 1}, {'i' : 2}]
+
+        with fh.open_writer(mode = 'object') as writer:
+            writer.put('a', [1, 2])
+            writer.put('b', None)
+        assert fh.read() == {'a' : [1, 2], 'b' : None}
+
+        with fh.open_writer():
+            pass
+        assert fh.read() == []
+
+    def test_yaml_document_writer(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'docs.yaml')
+
+        with fh.open_writer() as writer:
+            writer.write_document({'kind' : 'A'})
+            writer.write_document({'kind' : 'B'})
+
+        documents = list(fh.extension.yaml.load_all(fh.path))
+        assert documents == [{'kind' : 'A'}, {'kind' : 'B'}]
+
+    def test_abort_leaves_file_untouched(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'lines.txt')
+        fh.write(['kept'])
+
+        with pytest.raises(RuntimeError):
+            with fh.open_writer() as writer:
+                writer.write_line('discarded')
+                raise RuntimeError
+
+        assert fh.read() == ['kept\n']
+        assert [path.name for path in tmp_path.iterdir()] == ['lines.txt']
+
+    def test_new_file_mode(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'w.txt', create = False)
+        with fh.open_writer() as writer:
+            writer.write_line('line')
+
+        plain = FileHandler(tmp_path / 'plain.txt', create = False)
+        plain.write(['line'])
+
+        assert fh.path.stat().st_mode == plain.path.stat().st_mode
+
+    def test_new_file_mode_follows_current_umask(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'private.txt', create = False)
+
+        previous = os.umask(0o077)
+        try:
+            with fh.open_writer() as writer:
+                writer.write_line('line')
+        finally:
+            os.umask(previous)
+
+        assert fh.path.stat().st_mode & 0o777 == 0o600
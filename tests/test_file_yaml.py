@@ -0,0 +1,84 @@
+from src.pyfilehandlers.file_yaml import YAMLFile
+
+from pathlib import Path
+
+
+
+MANIFEST = '''# bundle
+---
+kind: A
+---
+kind: B
+--- 3
+...
+---
+- x
+- y
+'''
+
+
+
+class TestYAMLFile:
+
+
+    def test_document_offsets(self, tmp_path : Path):
+        path = tmp_path / 'bundle.yaml'
+        path.write_text(MANIFEST)
+
+        offsets = YAMLFile(path).document_offsets()
+
+        assert len(offsets) == 4
+        assert offsets[0] == 0
+        assert MANIFEST[offsets[2]:].startswith('--- 3')
+
+    def test_iter_documents(self, tmp_path : Path):
+        path = tmp_path / 'bundle.yaml'
+        path.write_text(MANIFEST)
+        yf = YAMLFile(path)
+
+        documents = list(yf.iter_documents())
+        assert documents == [{'kind' : 'A'}, {'kind' : 'B'}, 3, ['x', 'y']]
+        assert list(yf.iter_documents(1, 3)) == [{'kind' : 'B'}, 3]
+        assert list(yf.iter_documents(skip = {1, 2})) == [{'kind' : 'A'}, ['x', 'y']]
+        assert yf.read_document(3) == ['x', 'y']
+
+    def test_first_document_without_marker(self, tmp_path : Path):
+        path = tmp_path / 'bundle.yaml'
+        path.write_text('a: 1\n---\nb: 2\n')
+
+        assert YAMLFile(path).read_document(1) == {'b' : 2}
+
+    def test_read_documents_parallel(self, tmp_path : Path):
+        path = tmp_path / 'bundle.yaml'
+        path.write_text(''.join(f'---\nindex: {i}\n' for i in range(20)))
+
+        documents = YAMLFile(path).read_documents_parallel(2, documents_per_task = 3)
+
+        assert documents == [{'index' : i} for i in range(20)]
+
+    def test_read_documents_parallel_without_documents(self, tmp_path : Path):
+        path = tmp_path / 'empty.yaml'
+        path.write_text('# only a comment\n')
+
+        assert YAMLFile(path).read_documents_parallel(2) == []
+
+    def test_directives_after_document_end(self, tmp_path : Path):
+        path = tmp_path / 'bundle.yaml'
+        path.write_text('---\na: 1\n...\n%YAML 1.2\n---\nb: 2\n')
+        yf = YAMLFile(path)
+
+        assert yf.read_document(1) == {'b' : 2}
+        assert yf.read_documents_parallel(2, documents_per_task = 1) == [{'a' : 1}, {'b' : 2}]
+
+    def test_interleaved_reads(self, tmp_path : Path):
+        path = tmp_path / 'bundle.yaml'
+        path.write_text(''.join(f'---\nindex: {i}\n' for i in range(5)))
+        yf = YAMLFile(path)
+
+        first = yf.iter_documents()
+        assert next(first) == {'index' : 0}
+        assert yf.read_document(3) == {'index' : 3}
+        assert list(first) == [{'index' : i} for i in range(1, 5)]
+
+        pairs = list(zip(yf.iter_documents(), yf.iter_documents()))
+        assert pairs == [({'index' : i}, {'index' : i}) for i in range(5)]
@@ -0,0 +1,60 @@
+from src.pyfilehandlers.file_handler import FileHandler
+from src.pyfilehandlers import line_store
+from src.pyfilehandlers.line_store import LineStore
+
+from pathlib import Path
+import pytest
+
+
+
+class TestLineStore:
+
+
+    def test_read_compact_matches_readlines(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'lines.txt')
+        fh.write([f'line {i}' for i in range(1000)])
+
+        lines = fh.read(compact = True)
+
+        assert isinstance(lines, LineStore)
+        assert len(lines) == 1000
+        assert list(lines) == [line.rstrip('\n') for line in fh.read()]
+        assert lines[-1] == 'line 999'
+
+    def test_line_endings_and_chunk_boundaries(self, monkeypatch):
+        monkeypatch.setattr(line_store, 'SCAN_CHUNK_SIZE', 4)
+
+        lines = LineStore.from_bytes(b'a\r\nbb\rccccccc\n\nlast')
+
+        assert list(lines) == ['a', 'bb', 'ccccccc', '', 'last']
+
+    def test_slicing_shares_buffer(self):
+        lines = LineStore.from_bytes(b'\n'.join(b'%d' % i for i in range(10)))
+
+        window = lines[2:5]
+
+        assert isinstance(window, LineStore)
+        assert list(window) == ['2', '3', '4']
+        assert window._buffer is lines._buffer
+        assert lines[::3] == ['0', '3', '6', '9']
+        assert len(lines[8:2]) == 0
+        with pytest.raises(IndexError):
+            lines[10]
+
+    def test_search(self):
+        lines = LineStore.from_bytes('alpha\nbeta\nbé\nbeta\n'.encode())
+
+        assert lines.find('et') == 1
+        assert lines.find('a\nb') == -1
+        assert lines.find('é') == 2
+        assert lines.index('beta') == 1
+        assert lines.count('beta') == 2
+        assert 'bet' not in lines
+        assert 'beta' in lines[2:]
+
+    def test_bisect_sorted(self):
+        lines = LineStore.from_bytes(b'apple\nbanana\nbanana\ncherry\n')
+
+        assert lines.bisect_left('banana') == 1
+        assert lines.bisect_right('banana') == 3
+        assert lines.bisect_left('zebra') == 4
@@ -0,0 +1,88 @@
+from src.pyfilehandlers.file_handler import FileHandler
+from src.pyfilehandlers.schema import SchemaError, decode, encode
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+import pytest
+
+
+
+@dataclass(slots=True)
+class Point:
+    x : float
+    y : float
+
+
+class Size(NamedTuple):
+    width : int
+    height : int = 1
+
+
+@dataclass(slots=True)
+class Shape:
+    name : str
+    points : list[Point]
+    size : Size | None = None
+    tags : list[str] = field(default_factory=list)
+
+
+
+class TestSchema:
+
+
+    def test_decode_nested(self):
+        data = {
+            'name' : 'tri',
+            'points' : [{'x' : 0, 'y' : 0}, {'x' : 1.5, 'y' : 2}],
+            'size' : [3],
+        }
+
+        shape = decode(data, Shape)
+
+        assert shape == Shape('tri', [Point(0.0, 0.0), Point(1.5, 2.0)], Size(3, 1))
+        assert isinstance(shape.points[0].x, float)
+
+    def test_decode_reports_path(self):
+        data = {'name' : 'tri', 'points' : [{'x' : 0, 'y' : 'up'}]}
+
+        with pytest.raises(SchemaError) as e:
+            decode(data, Shape)
+        assert e.value.path == ['points', '0', 'y']
+
+    def test_decode_rejects_unknown_and_missing_fields(self):
+        with pytest.raises(SchemaError):
+            decode({'x' : 1, 'y' : 2, 'z' : 3}, Point)
+        with pytest.raises(SchemaError):
+            decode({'x' : 1}, Point)
+
+    def test_encode_round_trip(self):
+        shape = Shape('sq', [Point(1.0, 1.0)], Size(2, 2), ['a'])
+
+        assert decode(encode(shape), Shape) == shape
+
+    def test_decode_concurrent_first_use(self):
+        class Pair(NamedTuple):
+            first : int
+            second : int
+
+        with ThreadPoolExecutor(8) as executor:
+            pairs = list(executor.map(decode, [[1, 2]] * 64, [Pair] * 64))
+
+        assert pairs == [Pair(1, 2)] * 64
+
+
+    def test_json_read_write_schema(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'shapes.json')
+        shapes = [Shape('a', [Point(0.0, 1.0)]), Shape('b', [], Size(4, 5))]
+
+        assert fh.write(shapes)
+        assert fh.read(schema = list[Shape]) == shapes
+
+    def test_yaml_read_write_schema(self, tmp_path : Path):
+        fh = FileHandler(tmp_path / 'shapes.yaml')
+        shapes = {'first' : Shape('a', [Point(0.0, 1.0)], Size(1, 2))}
+
+        assert fh.write(shapes)
+        assert fh.read(schema = dict[str, Shape]) == shapes
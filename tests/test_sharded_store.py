@@ -0,0 +1,59 @@
+from src.pyfilehandlers.sharded_store import ShardedStore
+
+from pathlib import Path
+import pytest
+
+
+
+class TestShardedStore:
+
+
+    def test_set_get_persist(self, tmp_path : Path):
+        with ShardedStore(tmp_path / 'store', shard_count = 8) as store:
+            for i in range(100):
+                store[f'key{i}'] = {'value' : i}
+            del store['key0']
+
+        store = ShardedStore(tmp_path / 'store')
+
+        assert len(store) == 99
+        assert store['key42'] == {'value' : 42}
+        assert 'key0' not in store
+        assert sorted(store) == sorted(f'key{i}' for i in range(1, 100))
+
+    def test_get_touches_one_shard(self, tmp_path : Path):
+        with ShardedStore(tmp_path / 'store', shard_count = 8) as store:
+            for i in range(100):
+                store[f'key{i}'] = i
+
+        store = ShardedStore(tmp_path / 'store')
+        assert store['key7'] == 7
+        assert len(store._cache) == 1
+
+    def test_eviction_writes_dirty_shards(self, tmp_path : Path):
+        store = ShardedStore(
+            tmp_path / 'store', shard_count = 16, extension = '.yaml',
+            max_cached_shards = 2, max_dirty_shards = 100
+        )
+        for i in range(50):
+            store[f'key{i}'] = i
+
+        assert len(store._cache) == 2
+        store.flush()
+        assert dict(ShardedStore(tmp_path / 'store')) == {f'key{i}' : i for i in range(50)}
+
+    def test_resize(self, tmp_path : Path):
+        with ShardedStore(tmp_path / 'store', shard_count = 4) as store:
+            store.update({f'key{i}' : i for i in range(40)})
+
+        resized = ShardedStore.resize(tmp_path / 'store', 10)
+
+        assert resized.shard_count == 10
+        assert dict(resized) == {f'key{i}' : i for i in range(40)}
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['store']
+
+    def test_rejects_shard_count_mismatch(self, tmp_path : Path):
+        ShardedStore(tmp_path / 'store', shard_count = 4)
+
+        with pytest.raises(ValueError):
+            ShardedStore(tmp_path / 'store', shard_count = 5)